@@ -0,0 +1,131 @@
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from foundry_cards import card_to_int, popcount
+
+# Every five-rank straight window as a 13-bit rank mask, the wheel (A2345) included
+STRAIGHT_WINDOWS = np.array([0b1000000001111] + [0b11111 << low for low in range(9)], dtype=np.int64)
+
+SUIT_PATTERNS = ("rainbow", "two-tone", "monotone")  # flop suit patterns by most cards of one suit, minus one
+
+# Columns of the texture arrays
+TEXTURE_FIELDS = (
+    "wetness",  # 0 (dry) to 1 (wet): average of the flush and straight scores below
+    "connectedness",  # 0 when no two ranks fit in one straight, 1 when every distinct rank fits in one
+    "flush_score",  # 0 with every card a different suit, 0.5 with two of a suit, 1 with three or more
+    "pairs",  # board cards that repeat a rank already on the board: 0 unpaired, 1 paired, 2 trips or two pair
+    "max_suit",  # most cards of any one suit
+    "high_rank",  # highest rank, 0 (deuce) to 12 (ace)
+    "flush_possible",  # someone can hold a flush
+    "flush_draw_possible",  # a card to come can complete a flush
+    "straight_possible",  # someone can hold a straight
+    "straight_draw_possible",  # a card to come can complete a straight
+)
+
+# Every flop as sorted card integers, in the order flop_index counts them
+FLOPS = np.array(list(combinations(range(52), 3)), dtype=np.int8)
+
+
+def texture_features(boards):
+    """
+    Computes the texture of many boards of the same size at once.
+
+    Every feature depends only on the ranks and on how the suits are grouped, so suit-isomorphic
+    boards get identical rows.
+
+    :param boards: Array of card integers, shape (N, 3 to 5).
+    :return: float array of shape (N, len(TEXTURE_FIELDS)).
+    """
+    boards = np.asarray(boards, dtype=np.int64)
+    n, size = boards.shape
+    ranks, suits = boards >> 2, boards & 3
+
+    rank_masks = np.bitwise_or.reduce(1 << ranks, axis=1)
+    distinct = popcount(rank_masks)
+    window_ranks = popcount(rank_masks[:, None] & STRAIGHT_WINDOWS[None, :]).max(axis=1)
+    max_suit = np.stack([(suits == s).sum(axis=1) for s in range(4)], axis=1).max(axis=1)
+
+    features = np.zeros((n, len(TEXTURE_FIELDS)))
+    columns = {name: features[:, i] for i, name in enumerate(TEXTURE_FIELDS)}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        columns["connectedness"][:] = np.where(
+            distinct > 1, (window_ranks - 1) / (np.minimum(distinct, 5) - 1), 0.0
+        )
+    columns["flush_score"][:] = np.minimum(max_suit - 1, 2) / 2
+    columns["wetness"][:] = (columns["flush_score"] + columns["connectedness"]) / 2
+    columns["pairs"][:] = size - distinct
+    columns["max_suit"][:] = max_suit
+    columns["high_rank"][:] = ranks.max(axis=1)
+    columns["flush_possible"][:] = max_suit >= 3
+    columns["flush_draw_possible"][:] = (max_suit >= 2) & (size < 5)
+    columns["straight_possible"][:] = window_ranks >= 3
+    columns["straight_draw_possible"][:] = (window_ranks >= 2) & (size < 5)
+    return features
+
+
+def flop_index(flops):
+    """
+    Returns each flop's row in FLOP_TEXTURES: its position among all 22,100 sorted flops.
+
+    :param flops: Array of card integers, shape (N, 3) or (3,), in any order.
+    """
+    flops = np.sort(np.asarray(flops, dtype=np.int64), axis=-1)
+    c0, c1, c2 = flops[..., 0], flops[..., 1], flops[..., 2]
+    # Combinatorial number system for sorted triples, turned around to match the order of combinations()
+    last = comb(52, 3) - 1
+    return last - (_COMB3[51 - c0] + _COMB2[51 - c1] + (51 - c2))
+
+
+_COMB2 = np.array([comb(k, 2) for k in range(52)], dtype=np.int64)
+_COMB3 = np.array([comb(k, 3) for k in range(52)], dtype=np.int64)
+
+# Texture of every flop, looked up by flop_index
+FLOP_TEXTURES = texture_features(FLOPS)
+
+
+def board_texture(board):
+    """
+    Describes a flop, turn or river board. Flops come straight from the precomputed table.
+
+    :param board: 3 to 5 cards, as strings or card integers.
+    :return: Dict with every field in TEXTURE_FIELDS (flags as bools, counts as ints) plus 'suit_pattern'
+             for flops.
+    """
+    cards = [card_to_int(c) for c in board]
+    if not (3 <= len(cards) <= 5):
+        raise ValueError("Board texture needs 3 to 5 community cards.")
+
+    row = FLOP_TEXTURES[flop_index(cards)] if len(cards) == 3 else texture_features([cards])[0]
+    texture = {name: float(value) for name, value in zip(TEXTURE_FIELDS, row)}
+    for name in ("pairs", "max_suit", "high_rank"):
+        texture[name] = int(texture[name])
+    for name in ("flush_possible", "flush_draw_possible", "straight_possible", "straight_draw_possible"):
+        texture[name] = bool(texture[name])
+    texture["paired"] = texture["pairs"] > 0
+    if len(cards) == 3:
+        texture["suit_pattern"] = SUIT_PATTERNS[texture["max_suit"] - 1]
+    return texture
+
+
+def board_wetness(boards):
+    """
+    Returns the wetness of many boards of the same size, using the flop table for flops.
+
+    :param boards: Array of card integers, shape (N, 3 to 5).
+    """
+    boards = np.asarray(boards, dtype=np.int64)
+    wetness = TEXTURE_FIELDS.index("wetness")
+    if boards.shape[1] == 3:
+        return FLOP_TEXTURES[flop_index(boards), wetness]
+    return texture_features(boards)[:, wetness]
+
+
+# Example usage
+if __name__ == "__main__":
+    for flop in (["KC", "7D", "2H"], ["9H", "8H", "7D"], ["QS", "QD", "4C"], ["JC", "10C", "5C"]):
+        texture = board_texture(flop)
+        print(f"{' '.join(flop)}: wetness {texture['wetness']:.2f}, {texture['suit_pattern']}, "
+              f"paired {texture['paired']}, straight draws {texture['straight_draw_possible']}")
+    print(board_texture(["9H", "8H", "7D", "2C", "KS"]))
@@ -1,133 +1,152 @@
-import PokerPy
-from PokerPy import Card, calculate_hand_frequency, get_best_hand
-import eval7
-from itertools import combinations
+import numpy as np
 
-import eval7
-from itertools import combinations
+from foundry_evaluator import HAND_CATEGORIES, cards_to_array, evaluate_batch, hand_category
+from foundry_preflop_table import get_preflop_table
+from foundry_street_equity import street_equity
 
-def best_possible_hole_cards(board_strs):
-    """
-    Returns the best 2-card villain combo given a board like ['QC', '5H', 'AC'].
-    """
-    def normalize(card_str):
-        rank = card_str[:-1]
-        suit = card_str[-1]
-        rank = 'T' if rank == '10' else rank.upper()
-        suit = suit.lower()  # Lowercase suits for eval7
-        return eval7.Card(rank + suit)
-
-    try:
-        board = [normalize(s) for s in board_strs]
-        deck = eval7.Deck()
-
-        # Remove board cards using ascii_representation (e.g., 'Ah', 'Qc')
-        board_ascii = {card.__str__() for card in board}
-        deck.cards = [card for card in deck.cards if str(card) not in board_ascii]
-
-        best_score = -1
-        best_hole = None
-
-        for h1, h2 in combinations(deck.cards, 2):
-            score = eval7.evaluate(board + [h1, h2])
-            if score > best_score:
-                best_score = score
-                best_hole = (h1, h2)
 
-        return best_hole
+# Boards with at least this many cards are enumerated exactly (990 runouts on the flop, 44 on the turn)
+EXACT_ENUMERATION_MIN_BOARD = 3
 
-    except Exception as e:
-        import logging
-        logging.warning(f"Error in best_possible_hole_cards: {e}")
-        return None
 
+# Adaptive sampling stops once the win rate's standard error is below this
+ADAPTIVE_TARGET_ERROR = 0.005
+ADAPTIVE_BATCH_SIZE = 2000
+ADAPTIVE_MAX_SAMPLES = 200000
 
 
-
-def get_hero_win_rate(hero_hand, villain_hand, community_cards=[]):
+def iter_adaptive_equity(hero_strs, villain_strs, board_strs=[], target_error=ADAPTIVE_TARGET_ERROR,
+                         batch_size=ADAPTIVE_BATCH_SIZE, max_samples=ADAPTIVE_MAX_SAMPLES, seed=None,
+                         breakdown=False):
     """
-    Extracts and returns only the win probability for Hero as a precise decimal.
-
-    :param hero_hand: List of two Card objects representing Hero's hole cards.
-    :param villain_hand: List of two Card objects representing Villain's hole cards.
-    :param community_cards: List of 0 to 5 Card objects representing the community cards.
-    :return: Hero's win probability as a decimal.
+    Samples runouts in batches and yields a refined estimate after each batch, stopping as
+    soon as the win rate's standard error drops below target_error.
+
+    :param hero_strs: Hero's two cards, as strings like ['AC', '7C'] or card integers.
+    :param villain_strs: Villain's two cards, as strings like ['KC', '10H'] or card integers.
+    :param board_strs: 0 to 5 community cards, as strings or card integers.
+    :param target_error: Standard error of the win rate to stop at (0.005 = ±0.5%).
+    :param batch_size: Runouts evaluated per batch.
+    :param max_samples: Hard cap on runouts.
+    :param seed: Optional seed for a reproducible run.
+    :param breakdown: If True, also report how often Hero makes each hand category.
+    :return: Generator of dicts with 'win', 'tie', 'loss', 'samples', 'error' and 'done'.
     """
-    if not (0 <= len(community_cards) <= 5):
+    if not (0 <= len(board_strs) <= 5):
         raise ValueError("Community cards must be between 0 and 5.")
 
-    if len(community_cards) == 5:
-        # Directly determine the best hand without simulation
-        hero_best_hand = get_best_hand(hero_hand + community_cards)
-        villain_best_hand = get_best_hand(villain_hand + community_cards)
-
-        # Compare hand strength using heuristic value if available
-        hero_strength = hero_best_hand.hand_heuristic()
-        villain_strength = villain_best_hand.hand_heuristic()
+    hero = cards_to_array(hero_strs)
+    villain = cards_to_array(villain_strs)
+    board = cards_to_array(board_strs)
+    deck = np.setdiff1d(np.arange(52, dtype=np.int8), np.concatenate([hero, villain, board]))
+    missing = 5 - len(board)
+
+    rng = np.random.default_rng(seed)
+    wins = ties = samples = 0
+    category_counts = np.zeros(len(HAND_CATEGORIES), dtype=np.int64)
+
+    while True:
+        runouts = deck[np.argsort(rng.random((batch_size, len(deck))), axis=1)[:, :missing]]
+        boards = np.concatenate([np.broadcast_to(board, (batch_size, len(board))), runouts], axis=1)
+        scores = evaluate_batch(np.concatenate([
+            np.concatenate([np.broadcast_to(hero, (batch_size, 2)), boards], axis=1),
+            np.concatenate([np.broadcast_to(villain, (batch_size, 2)), boards], axis=1),
+        ]))
+        hero_scores, villain_scores = scores[:batch_size], scores[batch_size:]
+
+        wins += int((hero_scores > villain_scores).sum())
+        ties += int((hero_scores == villain_scores).sum())
+        samples += batch_size
+        if breakdown:
+            category_counts += np.bincount(hand_category(hero_scores), minlength=len(HAND_CATEGORIES))
+
+        win, tie = wins / samples, ties / samples
+        error = (win * (1 - win) / samples) ** 0.5
+        done = error <= target_error or samples >= max_samples
+
+        result = {"win": win, "tie": tie, "loss": max(0.0, 1.0 - win - tie),
+                  "samples": samples, "error": error, "done": done}
+        if breakdown:
+            result["categories"] = {
+                HAND_CATEGORIES[i]: int(count) / samples for i, count in enumerate(category_counts) if count
+            }
+        yield result
+
+        if done:
+            return
+
+
+def adaptive_hero_equity(hero_strs, villain_strs, board_strs=[], target_error=ADAPTIVE_TARGET_ERROR, **kwargs):
+    """
+    Runs iter_adaptive_equity to completion and returns the final estimate.
+    """
+    for result in iter_adaptive_equity(hero_strs, villain_strs, board_strs, target_error, **kwargs):
+        pass
+    return result
 
-        if hero_strength > villain_strength:
-            return 1.0  # Hero wins outright
-        elif hero_strength == villain_strength:
-            return 0.0  # No outright win (tie handled separately)
-        else:
-            return 0.0  # Hero loses outright
 
-    # If fewer than 5 community cards, use Monte Carlo simulation
-    player_hands = [
-        [*hero_hand, *community_cards],
-        [*villain_hand, *community_cards]
-    ]
+def calculate_equity(hero_strs, villain_strs, board_strs=[], breakdown=False):
+    """
+    Picks the equity backend by board size: exact enumeration from the flop on (the turn and
+    river reuse the flop's runouts), the precomputed preflop table when it has been built,
+    and adaptive sampling otherwise.
+
+    :param hero_strs: Hero's two cards, as strings like ['AC', '7C'] or card integers.
+    :param villain_strs: Villain's two cards, as strings like ['KC', '10H'] or card integers.
+    :param board_strs: 0 to 5 community cards, as strings or card integers.
+    :param breakdown: If True, also return how often Hero makes each hand category.
+    :return: Dict with 'win', 'tie' and 'loss' decimals, plus 'categories' when breakdown is set.
+    """
+    if len(board_strs) >= EXACT_ENUMERATION_MIN_BOARD:
+        return street_equity(hero_strs, villain_strs, board_strs, breakdown)
 
-    frequencies = calculate_hand_frequency(player_hands)
-    total_simulations = frequencies[0].get("Total Cases", 1)
+    if not board_strs and not breakdown:
+        table = get_preflop_table()
+        if table is not None:
+            result = table.lookup(hero_strs, villain_strs)
+            if result is not None:
+                return result
 
-    hero_win = frequencies[0].get("Win", 0) / total_simulations
-    return hero_win
+    return adaptive_hero_equity(hero_strs, villain_strs, board_strs, breakdown=breakdown)
 
 
-def get_hero_tie_rate(hero_hand, villain_hand, community_cards=[]):
+def get_hero_win_rate(hero_strs, villain_strs, board_strs=[]):
     """
-    Extracts and returns only the tie probability for Hero as a precise decimal.
+    Returns only Hero's win probability, through the shared equity cache in front of calculate_equity
+    (so preflop reads the precomputed table).
 
-    :param hero_hand: List of two Card objects representing Hero's hole cards.
-    :param villain_hand: List of two Card objects representing Villain's hole cards.
-    :param community_cards: List of 0 to 5 Card objects representing the community cards.
-    :return: Hero's tie probability as a decimal.
+    :param hero_strs: Hero's two cards, as strings like ['AC', '7C'] or card integers.
+    :param villain_strs: Villain's two cards, as strings like ['KC', '10H'] or card integers.
+    :param board_strs: 0 to 5 community cards, as strings or card integers.
+    :return: Hero's win probability as a decimal.
     """
-    if not (0 <= len(community_cards) <= 5):
-        raise ValueError("Community cards must be between 0 and 5.")
+    from foundry_equity_cache import cached_equity  # imported here, foundry_equity_cache imports this module
 
-    if len(community_cards) == 5:
-        # Directly determine if it's a tie
-        hero_best_hand = get_best_hand(hero_hand + community_cards)
-        villain_best_hand = get_best_hand(villain_hand + community_cards)
+    return cached_equity(hero_strs, villain_strs, board_strs)["win"]
 
-        hero_strength = hero_best_hand.hand_heuristic()
-        villain_strength = villain_best_hand.hand_heuristic()
 
-        if hero_strength == villain_strength:
-            return 1.0  # 100% tie
-        else:
-            return 0.0  # No tie
-
-    # If fewer than 5 community cards, use Monte Carlo simulation
-    player_hands = [
-        [*hero_hand, *community_cards],
-        [*villain_hand, *community_cards]
-    ]
+def get_hero_tie_rate(hero_strs, villain_strs, board_strs=[]):
+    """
+    Returns only Hero's tie probability, through the shared equity cache in front of calculate_equity
+    (so preflop reads the precomputed table).
 
-    frequencies = calculate_hand_frequency(player_hands)
-    total_simulations = frequencies[0].get("Total Cases", 1)
+    :param hero_strs: Hero's two cards, as strings like ['AC', '7C'] or card integers.
+    :param villain_strs: Villain's two cards, as strings like ['KC', '10H'] or card integers.
+    :param board_strs: 0 to 5 community cards, as strings or card integers.
+    :return: Hero's tie probability as a decimal.
+    """
+    from foundry_equity_cache import cached_equity  # imported here, foundry_equity_cache imports this module
 
-    hero_tie = frequencies[0].get("Draw", 0) / total_simulations
-    return hero_tie
+    return cached_equity(hero_strs, villain_strs, board_strs)["tie"]
 
 
 # Example usage
 if __name__ == "__main__":
-    hero = [Card("AC"), Card("7C")]
-    villain = [Card("KC"), Card("10H")]
-    board = []  # Full 5 community cards
-
-    print(f"Hero Win Rate: {get_hero_win_rate(hero, villain, board)}")
-    print(f"Hero Tie Rate: {get_hero_tie_rate(hero, villain, board)}")
+    equity = calculate_equity(["AC", "7C"], ["KC", "10H"], [], breakdown=True)
+    print(f"Hero Win Rate: {equity['win']}")
+    print(f"Hero Tie Rate: {equity['tie']}")
+    print(f"Hero Loss Rate: {equity['loss']}")
+    print(f"Hero Hand Categories: {equity['categories']}")
+
+    flop_equity = calculate_equity(["AC", "7C"], ["KC", "10H"], ["QC", "5H", "2C"])
+    print(f"Hero Flop Win Rate (exact): {flop_equity['win']}")
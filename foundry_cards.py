@@ -0,0 +1,131 @@
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+# Cards are integers from 0 to 51: rank * 4 + suit
+# Ranks 2..A -> 0..12, suits C, D, H, S -> 0..3
+RANKS = "23456789TJQKA"
+SUITS = "CDHS"
+DECK = tuple(range(52))
+
+# Interned display strings, e.g. CARD_STRS[51] == 'AS'
+CARD_STRS = tuple(RANKS[c >> 2] + SUITS[c & 3] for c in DECK)
+
+
+def _build_lookup():
+    """
+    Maps every spelling the DOM, the calculator input and the libraries use ('TH', '10H', 'th', '10h'...)
+    to the card integer.
+    """
+    lookup = {}
+    for card, text in enumerate(CARD_STRS):
+        ranks = (text[0], "10") if text[0] == "T" else (text[0],)
+        for rank in ranks:
+            for suit in (text[1], text[1].lower()):
+                lookup[rank + suit] = card
+                lookup[rank.lower() + suit] = card
+    return lookup
+
+
+_CARD_LOOKUP = _build_lookup()
+_EVAL7_CARDS = None
+
+
+def parse_card(card) -> Optional[int]:
+    """
+    Parses a card string like '10H', 'TD' or 'qc' into its integer. Integers pass through.
+
+    :return: The card integer, or None if the string isn't a valid card.
+    """
+    if not isinstance(card, str):
+        return int(card)
+    return _CARD_LOOKUP.get(card.strip())
+
+
+def card_to_int(card) -> int:
+    """
+    Strict version of parse_card for library code: raises ValueError on an invalid card.
+    """
+    value = parse_card(card)
+    if value is None:
+        raise ValueError(f"Invalid card: '{card}'")
+    return value
+
+
+def parse_cards(cards: Iterable) -> Optional[List[int]]:
+    """
+    Parses a list of card strings. Returns None if any card is invalid.
+    """
+    parsed = [parse_card(c) for c in cards]
+    return None if None in parsed else parsed
+
+
+def parse_condensed(text: str) -> Optional[List[int]]:
+    """
+    Parses condensed card text like 'AHTD5C' (two characters per card, T for ten).
+    Returns None if the text is malformed.
+    """
+    if len(text) % 2 != 0:
+        return None
+    return parse_cards(text[i:i + 2] for i in range(0, len(text), 2))
+
+
+def card_str(card: int) -> str:
+    """Returns the condensed string for a card, e.g. 'TH'."""
+    return CARD_STRS[card]
+
+
+def condense(cards: Iterable[int]) -> str:
+    """Joins cards into condensed text, e.g. [47, 32] -> 'KSTC'."""
+    return "".join(CARD_STRS[c] for c in cards)
+
+
+def pokerpy_str(card: int) -> str:
+    """Returns the string PokerPy's Card expects, which spells ten as '10', e.g. '10H'."""
+    text = CARD_STRS[card]
+    return "10" + text[1] if text[0] == "T" else text
+
+
+def eval7_card(card: int):
+    """Returns the shared eval7.Card for a card integer, creating all 52 on first use."""
+    global _EVAL7_CARDS
+    if _EVAL7_CARDS is None:
+        import eval7
+        _EVAL7_CARDS = tuple(eval7.Card(text[0] + text[1].lower()) for text in CARD_STRS)
+    return _EVAL7_CARDS[card]
+
+
+def rank_of(card: int) -> int:
+    return card >> 2
+
+
+def suit_of(card: int) -> int:
+    return card & 3
+
+
+def cards_mask(cards: Iterable[int]) -> int:
+    """Packs cards into a 52-bit mask for fast overlap checks."""
+    mask = 0
+    for c in cards:
+        mask |= 1 << c
+    return mask
+
+
+def popcount(masks) -> np.ndarray:
+    """Counts the set bits of small non-negative integers, such as rank masks, elementwise."""
+    masks = np.asarray(masks, dtype=np.int64)
+    count = np.zeros(masks.shape, dtype=np.int64)
+    while masks.any():
+        count += masks & 1
+        masks = masks >> 1
+    return count
+
+
+def hand_class(card1: int, card2: int) -> str:
+    """
+    Returns the starting hand class with the higher rank first, e.g. 'AKs', 'T9o' or 'QQ'.
+    """
+    high, low = (card1, card2) if card1 >> 2 >= card2 >> 2 else (card2, card1)
+    if high >> 2 == low >> 2:
+        return RANKS[high >> 2] * 2
+    return RANKS[high >> 2] + RANKS[low >> 2] + ("s" if high & 3 == low & 3 else "o")
@@ -0,0 +1,122 @@
+import os
+import json
+import sqlite3
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from itertools import permutations
+
+from foundry_cards import card_to_int
+from foundry_calculator import calculate_equity
+
+SUIT_PERMUTATIONS = list(permutations(range(4)))
+DISK_CACHE_PATH = os.path.join("tables", "equity_cache.sqlite")
+
+
+def canonical_situation(hero_strs, villain_strs, board_strs):
+    """
+    Returns a key shared by every suit relabeling of a hero/villain/board situation,
+    e.g. AsKs vs QdQh on 7c2h9d and AhKh vs QcQs on 7d2s9c.
+
+    Board order does not change equity, so the board is sorted too.
+    """
+    hero = [card_to_int(s) for s in hero_strs]
+    villain = [card_to_int(s) for s in villain_strs]
+    board = [card_to_int(s) for s in board_strs]
+
+    best = None
+    for perm in SUIT_PERMUTATIONS:
+        key = tuple(
+            tuple(sorted(((c & ~3) | perm[c & 3] for c in cards), reverse=True))
+            for cards in (hero, villain, board)
+        )
+        if best is None or key < best:
+            best = key
+    return best
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+
+class EquityCache:
+    """
+    LRU cache of equity results in memory, backed by an optional SQLite file that persists across sessions.
+    """
+
+    def __init__(self, maxsize: int = 4096, path: str = None):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.stats = CacheStats()
+        self.db = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                self.db = sqlite3.connect(path)
+                self.db.execute("CREATE TABLE IF NOT EXISTS equity (situation TEXT PRIMARY KEY, result TEXT)")
+            except sqlite3.Error as e:
+                logging.warning(f"Equity disk cache disabled: {e}")
+                self.db = None
+
+    def get(self, key):
+        """Returns a cached result for a canonical situation, or None."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.stats.hits += 1
+            return self.entries[key]
+
+        if self.db is not None:
+            row = self.db.execute("SELECT result FROM equity WHERE situation = ?", (repr(key),)).fetchone()
+            if row:
+                self.stats.disk_hits += 1
+                result = json.loads(row[0])
+                self._remember(key, result)
+                return result
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, key, result):
+        """Stores a result in memory and, if enabled, on disk."""
+        self._remember(key, result)
+        if self.db is not None:
+            with self.db:
+                self.db.execute("INSERT OR REPLACE INTO equity VALUES (?, ?)", (repr(key), json.dumps(result)))
+
+    def _remember(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def get_stats(self):
+        """Returns hit/miss counters and the current size as a dict."""
+        return {**asdict(self.stats), "hit_rate": self.stats.hit_rate, "size": len(self.entries)}
+
+
+EQUITY_CACHE = EquityCache()
+
+
+def cached_equity(hero_strs, villain_strs, board_strs=[], breakdown=False, cache=None):
+    """
+    calculate_equity with a memoization layer keyed on the suit-canonical situation.
+
+    :param cache: EquityCache to use; defaults to the shared in-memory EQUITY_CACHE.
+    :return: Dict with 'win', 'tie' and 'loss' decimals, plus 'categories' when breakdown is set.
+    """
+    cache = cache or EQUITY_CACHE
+    key = canonical_situation(hero_strs, villain_strs, board_strs) + (breakdown,)
+
+    result = cache.get(key)
+    if result is None:
+        result = calculate_equity(hero_strs, villain_strs, board_strs, breakdown)
+        cache.put(key, result)
+    return result
@@ -0,0 +1,166 @@
+import queue
+import atexit
+import logging
+import multiprocessing
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from foundry_calculator import iter_adaptive_equity, EXACT_ENUMERATION_MIN_BOARD
+from foundry_street_equity import street_outs
+from foundry_preflop_table import get_preflop_table
+from foundry_range_equity import load_range, hand_vs_range_equity
+from foundry_multiway import multiway_equity, shutdown_pool
+from foundry_equity_cache import EquityCache, DISK_CACHE_PATH, canonical_situation, cached_equity
+
+_cache = None  # created inside each worker process, see _worker_loop
+
+
+def compute_equity(request):
+    """
+    Runs one equity request. Used inside the worker processes.
+
+    :param request: Dict with 'hero', 'board' and either 'villain' (two card strings)
+                    or 'villain_range' (a position) plus 'opponents' (number of villains).
+    :return: Equity dict with 'win', 'tie' and 'loss'. Hand-vs-hand requests on the flop or
+             turn also carry 'leader', 'outs' and per-card 'cards' from street_outs.
+    """
+    if request.get("villain_range"):
+        villain_range = load_range(request["villain_range"])
+        opponents = request.get("opponents", 1)
+        if opponents > 1:
+            return multiway_equity(request["hero"], [villain_range] * min(opponents, 8), request["board"])
+        return hand_vs_range_equity(request["hero"], *villain_range, request["board"])
+
+    result = cached_equity(request["hero"], request["villain"], request["board"], cache=_cache)
+    if len(request["board"]) in (3, 4):
+        # Outs name real cards, so they are added after the suit-canonical cache lookup
+        result = {**result, **street_outs(request["hero"], request["villain"], request["board"])}
+    return result
+
+
+def iter_equity(request):
+    """
+    Yields estimates for one request. Sampled hand-vs-hand spots stream a rough number
+    after every batch; everything else yields a single final result.
+    """
+    sampled = (
+        not request.get("villain_range")
+        and len(request["board"]) < EXACT_ENUMERATION_MIN_BOARD
+        and (request["board"] or get_preflop_table() is None)
+    )
+    if sampled:
+        key = canonical_situation(request["hero"], request["villain"], request["board"]) + (False,)
+        cached = _cache.get(key) if _cache is not None else None
+        if cached is not None:
+            yield cached
+            return
+
+        for estimate in iter_adaptive_equity(request["hero"], request["villain"], request["board"]):
+            if estimate["done"] and _cache is not None:
+                _cache.put(key, estimate)
+            yield estimate
+    else:
+        yield compute_equity(request)
+
+
+def _worker_loop(requests, responses):
+    """
+    Worker process body: always answers the newest queued request and skips older ones.
+    """
+    global _cache
+    _cache = EquityCache(path=DISK_CACHE_PATH)
+
+    try:
+        while True:
+            request_id, request = requests.get()
+            if request is None:
+                break
+
+            # A newer board may already be waiting; anything older is stale
+            try:
+                while True:
+                    request_id, request = requests.get_nowait()
+                    if request is None:
+                        return
+            except queue.Empty:
+                pass
+
+            try:
+                for estimate in iter_equity(request):
+                    responses.put((request_id, estimate))
+                    if not requests.empty():
+                        break  # a newer board arrived, stop refining this one
+            except Exception as e:
+                responses.put((request_id, {"error": str(e)}))
+    finally:
+        shutdown_pool()
+        logging.info(f"Equity cache stats: {_cache.get_stats()}")
+
+
+class EquityWorker(QObject):
+    """
+    Persistent pool of equity processes. Results are delivered on the Qt thread via result_ready.
+
+    The processes are not daemonic so large multiway spots can spread their trials over a process
+    pool of their own; shutdown is registered with atexit so they never outlive the overlay.
+    """
+    result_ready = pyqtSignal(int, dict)
+
+    def __init__(self, processes=1, poll_interval=25):
+        super().__init__()
+        self.requests = multiprocessing.Queue()
+        self.responses = multiprocessing.Queue()
+        self.latest_id = 0
+
+        self.processes = [
+            multiprocessing.Process(target=_worker_loop, args=(self.requests, self.responses))
+            for _ in range(processes)
+        ]
+        for process in self.processes:
+            process.start()
+        atexit.register(self.shutdown)
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._deliver_results)
+        self.timer.start(poll_interval)
+
+    def submit(self, request):
+        """
+        Queues a request and returns its id. Any request still pending becomes stale.
+        """
+        self.latest_id += 1
+        self.requests.put((self.latest_id, request))
+        return self.latest_id
+
+    def invalidate(self):
+        """
+        Marks every pending request stale, so no result is delivered until the next submit.
+        """
+        self.latest_id += 1
+
+    def _deliver_results(self):
+        while True:
+            try:
+                request_id, result = self.responses.get_nowait()
+            except queue.Empty:
+                return
+            if request_id != self.latest_id:
+                continue  # superseded while it was running
+            self.result_ready.emit(request_id, result)
+
+    def shutdown(self):
+        """
+        Stops the worker processes. Safe to call more than once.
+        """
+        if not self.processes:
+            return
+        self.timer.stop()
+        for _ in self.processes:
+            self.requests.put((0, None))
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                logging.warning("Equity worker did not stop, terminating it")
+                process.terminate()
+                process.join()
+        self.processes = []
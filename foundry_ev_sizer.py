@@ -0,0 +1,148 @@
+import numpy as np
+
+# Bet sizes tried, as fractions of the pot (or of a pot-sized raise when facing a bet); all-in is always added
+CANDIDATE_POT_FRACTIONS = np.array([0.25, 0.33, 0.5, 0.66, 0.75, 1.0, 1.25, 1.5, 2.0])
+
+# A bet risking b to win pot P breaks even as a bluff when the villain folds b / (P + b) of the time,
+# which is 0.5 for a pot-sized bet. Villain stats scale that curve up or down.
+REFERENCE_FOLD = 0.5
+MAX_FOLD = 0.95  # nobody folds every hand
+PRIOR_HANDS = 20  # tracker stats are shrunk toward REFERENCE_FOLD as if seen over this many extra hands
+CBF_WEIGHT = 0.5  # postflop calling tendency blends CBF and WTSD, the rest is WTSD
+
+# Without a per-combo equity histogram, Hero is assumed to hold this much equity against the hands that fold
+FOLDED_HAND_EQUITY = 0.75
+
+
+def stat_rate(stats, key, default=REFERENCE_FOLD, prior=PRIOR_HANDS):
+    """
+    Returns a tracker stat as a 0-1 rate, shrunk toward `default` while the sample is small.
+
+    :param stats: One player's entry from player_data/player_stats.json, e.g. {"F3B": {"num": 3, "den": 5}}.
+    """
+    entry = (stats or {}).get(key) or {}
+    num, den = entry.get("num", 0), entry.get("den", 0)
+    return (num + prior * default) / (den + prior)
+
+
+def fold_tendency(stats, street):
+    """
+    Returns how often the villain folds to a pot-sized bet, estimated from their tracker stats.
+
+    Preflop that is their fold-to-3-bet rate. Postflop it is one minus their calling tendency,
+    from how often they call big flop bets (CBF) and go to showdown (WTSD).
+
+    :param street: 'preflop' or 'postflop'.
+    """
+    if street == 'preflop':
+        return stat_rate(stats, "F3B")
+    calls = CBF_WEIGHT * stat_rate(stats, "CBF", 1 - REFERENCE_FOLD) \
+        + (1 - CBF_WEIGHT) * stat_rate(stats, "WTSD", 1 - REFERENCE_FOLD)
+    return 1 - calls
+
+
+def fold_probability(risks, pot_size, tendency):
+    """
+    Returns the villain's fold probability for each amount Hero risks, for a pot of `pot_size`.
+
+    :param risks: Array of Hero's total bet or raise sizes.
+    :param tendency: Fold rate to a pot-sized bet, see fold_tendency.
+    """
+    risks = np.asarray(risks, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balanced = np.where(pot_size + risks > 0, risks / (pot_size + risks), 0.0)
+    return np.clip(balanced * tendency / REFERENCE_FOLD, 0.0, MAX_FOLD)
+
+
+def called_equity(equity, folds, equity_histogram=None):
+    """
+    Returns Hero's equity against the part of the villain's range that continues, for each fold probability.
+
+    The villain folds the hands Hero does best against. With equity_histogram those are taken off the
+    top of the histogram; otherwise Hero is assumed to have FOLDED_HAND_EQUITY against them.
+
+    :param folds: Array of fold probabilities.
+    :param equity_histogram: Optional result of foundry_range_equity.equity_distribution.
+    """
+    folds = np.asarray(folds, dtype=float)
+    calls = np.maximum(1 - folds, 1e-9)
+    if equity_histogram is None:
+        return np.clip((equity - folds * FOLDED_HAND_EQUITY) / calls, 0.0, max(equity, 0.0))
+
+    # Bins from Hero's best equity down, with the share of the range already folded before each one
+    shares = np.array(equity_histogram["histogram"], dtype=float)[::-1]
+    edges = np.array(equity_histogram["bin_edges"], dtype=float)
+    centers = ((edges[:-1] + edges[1:]) / 2)[::-1]
+    before = np.concatenate([[0.0], np.cumsum(shares)[:-1]])
+
+    folded = np.clip(folds[:, None] - before[None, :], 0.0, shares[None, :])
+    return ((shares - folded) * centers).sum(axis=1) / calls
+
+
+def ev_bet_size(equity, pot_size, hero_stack, villain_stack, facing_bet=0, villain_stats=None,
+                street='postflop', fractions=CANDIDATE_POT_FRACTIONS, equity_histogram=None):
+    """
+    Picks the bet or raise size with the highest expected value.
+
+    Each candidate size wins the pot when the villain folds and otherwise plays for Hero's
+    equity against the hands that call, in the bigger pot. All candidates are evaluated together in NumPy.
+
+    :param equity: Hero's share of the pot at showdown against the villain's range (win + tie / 2).
+    :param pot_size: The pot, including any bet Hero is facing.
+    :param hero_stack: Hero's stack; sizes are capped at the effective stack.
+    :param villain_stack: The villain's remaining stack behind their bet.
+    :param facing_bet: The villain's bet Hero is raising, or 0 to open the betting.
+    :param villain_stats: The villain's tracker stats, see stat_rate. Missing stats use REFERENCE_FOLD.
+    :param street: 'preflop' or 'postflop', selects which stats drive the fold model.
+    :param fractions: Candidate sizes as fractions of the pot, or of pot + 2 x facing_bet when raising.
+    :param equity_histogram: Optional equity_distribution result for the villain's range, see called_equity.
+    :return: Dict with 'size' and 'ev' of the best candidate, 'passive_action' ('check', or 'call'
+             when facing a bet) with its 'passive_ev', and the 'sizes', 'evs' and 'folds' arrays of
+             every candidate.
+    """
+    all_in = min(hero_stack, villain_stack + facing_bet)
+    sizes = np.asarray(fractions, dtype=float) * (pot_size + 2 * facing_bet)
+    sizes = np.unique(np.minimum(np.append(np.maximum(sizes, 2 * facing_bet), all_in), all_in))
+    sizes = sizes[sizes > facing_bet]
+
+    folds = fold_probability(sizes, pot_size, fold_tendency(villain_stats, street))
+    called_pot = pot_size + 2 * sizes - facing_bet
+    evs = folds * pot_size + (1 - folds) * (called_equity(equity, folds, equity_histogram) * called_pot - sizes)
+
+    call = min(facing_bet, hero_stack)
+    passive_ev = equity * (pot_size + call) - call
+
+    best = int(np.argmax(evs)) if len(evs) else None
+    return {
+        "size": round(float(sizes[best])) if best is not None else 0,
+        "ev": float(evs[best]) if best is not None else passive_ev,
+        "passive_action": "call" if facing_bet > 0 else "check",
+        "passive_ev": passive_ev,
+        "sizes": sizes,
+        "evs": evs,
+        "folds": folds,
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    sticky = {"CBF": {"num": 18, "den": 20}, "WTSD": {"num": 14, "den": 20}}
+    folder = {"CBF": {"num": 2, "den": 20}, "WTSD": {"num": 3, "den": 20}}
+    for name, stats in (("sticky", sticky), ("folder", folder), ("unknown", None)):
+        for equity in (0.25, 0.5, 0.75):
+            result = ev_bet_size(equity, pot_size=100, hero_stack=600, villain_stack=450, villain_stats=stats)
+            print(f"{name} at {equity:.0%} equity: bet {result['size']} for EV {result['ev']:.1f}"
+                  f" (check {result['passive_ev']:.1f})")
+
+    from foundry_range_equity import equity_distribution, load_range
+
+    histogram = equity_distribution(["AC", "7C"], *load_range("btn"), ["QC", "5H", "2C"])
+    result = ev_bet_size(histogram["equity"], 100, 600, 450, villain_stats=folder, equity_histogram=histogram)
+    print(f"AC7C vs BTN range at {histogram['equity']:.0%}: bet {result['size']} for EV {result['ev']:.1f}")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        ev_bet_size(0.6, 100, 600, 450, facing_bet=30, villain_stats=sticky)
+    print(f"{(time.perf_counter() - start):.3f} ms per sizing")
@@ -0,0 +1,198 @@
+import time
+
+import numpy as np
+
+from foundry_cards import card_to_int, eval7_card, pokerpy_str
+
+HAND_CATEGORIES = [
+    "High Card", "Pair", "Two Pair", "Trips", "Straight",
+    "Flush", "Full House", "Quads", "Straight Flush"
+]
+CATEGORY_SHIFT = 20  # scores are category << 20 | up to five 4-bit kicker ranks
+
+
+def cards_to_array(card_strs):
+    """
+    Converts a list of cards (strings or integers) into an int8 array.
+    """
+    return np.array([card_to_int(s) for s in card_strs], dtype=np.int8)
+
+
+def _build_tables():
+    """
+    Precomputes per-13-bit-rank-mask lookups: highest rank, best straight and packed top-k kickers.
+    """
+    masks = np.arange(1 << 13)
+    high_rank = np.full(1 << 13, -1, dtype=np.int32)
+    straight_high = np.full(1 << 13, -1, dtype=np.int32)
+    top_k = np.zeros((6, 1 << 13), dtype=np.int32)
+
+    for mask in range(1, 1 << 13):
+        ranks = [r for r in range(12, -1, -1) if mask >> r & 1]
+        high_rank[mask] = ranks[0]
+        for k in range(1, 6):
+            packed = 0
+            for r in ranks[:k]:
+                packed = (packed << 4) | r
+            top_k[k, mask] = packed << (4 * (5 - min(k, len(ranks))))
+
+    # Straights, best first; the wheel (A-2-3-4-5) plays as a five-high straight
+    for high in range(12, 3, -1):
+        needed = 0b11111 << (high - 4)
+        hit = (masks & needed) == needed
+        straight_high[hit & (straight_high < 0)] = high
+    wheel = (1 << 12) | 0b1111
+    straight_high[((masks & wheel) == wheel) & (straight_high < 0)] = 3
+
+    return high_rank, straight_high, top_k
+
+
+HIGH_RANK, STRAIGHT_HIGH, TOP_K = _build_tables()
+
+
+# Rank counts are packed one 4-bit nibble per rank into an int64; these pick out one bit per nibble
+NIBBLE_LOW_BITS = np.int64(int("1" * 13, 16))
+NIBBLE_TO_BIT = np.array([
+    sum(1 << i for i in range(4) if chunk >> (4 * i) & 1) for chunk in range(1 << 16)
+], dtype=np.int32)
+
+
+def _compress_nibbles(indicator):
+    """
+    Turns an int64 with one flag bit per rank nibble into a 13-bit rank mask.
+    """
+    return (
+        NIBBLE_TO_BIT[indicator & 0xFFFF]
+        | NIBBLE_TO_BIT[(indicator >> 16) & 0xFFFF] << 4
+        | NIBBLE_TO_BIT[(indicator >> 32) & 0xFFFF] << 8
+        | NIBBLE_TO_BIT[(indicator >> 48) & 0xF] << 12
+    )
+
+
+def evaluate_batch(cards):
+    """
+    Ranks many 7-card (or 5/6-card) hands at once. Higher scores are better hands.
+
+    :param cards: Integer array of shape (N, 5..7) using the foundry_cards encoding.
+    :return: int32 array of N hand scores.
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    ranks = cards >> 2
+    suits = cards & 3
+
+    counts = (np.int64(1) << (ranks << 2)).sum(axis=1)
+    suit_counts = (np.int64(1) << (suits << 3)).sum(axis=1)
+    once = counts & NIBBLE_LOW_BITS
+    twice = (counts >> 1) & NIBBLE_LOW_BITS
+
+    all_mask = _compress_nibbles((counts | counts >> 1 | counts >> 2) & NIBBLE_LOW_BITS)
+    quad_mask = _compress_nibbles((counts >> 2) & NIBBLE_LOW_BITS)
+    trip_mask = _compress_nibbles(once & twice)
+    pair_mask = _compress_nibbles(twice & ~once)
+    single_mask = _compress_nibbles(once & ~twice)
+
+    # Suit counts sit in 8-bit lanes; a lane reaching 5 means a flush (only one suit can with 7 cards)
+    flush_lanes = ((suit_counts + 0x03030303) >> 3) & 0x01010101
+    has_flush = flush_lanes != 0
+    flush_mask = np.zeros(len(cards), dtype=np.int32)
+    if has_flush.any():
+        flush_suit = (np.log2(flush_lanes[has_flush]).astype(np.int64) >> 3)[:, None]
+        flush_rows = cards[has_flush]
+        flush_bits = np.where((flush_rows & 3) == flush_suit, 1 << (flush_rows >> 2), 0)
+        flush_mask[has_flush] = np.bitwise_or.reduce(flush_bits, axis=1)
+
+    straight_flush = STRAIGHT_HIGH[flush_mask]
+    straight = STRAIGHT_HIGH[all_mask]
+
+    quad_rank = HIGH_RANK[quad_mask]
+    trip_rank = HIGH_RANK[trip_mask]
+    full_house_pair = HIGH_RANK[(trip_mask & ~_rank_bit(trip_rank)) | pair_mask]
+    top_pair = HIGH_RANK[pair_mask]
+    second_pair = HIGH_RANK[pair_mask & ~_rank_bit(top_pair)]
+
+    conditions = [
+        straight_flush >= 0,
+        quad_rank >= 0,
+        (trip_rank >= 0) & (full_house_pair >= 0),
+        has_flush,
+        straight >= 0,
+        trip_rank >= 0,
+        second_pair >= 0,
+        top_pair >= 0,
+    ]
+    categories = [8, 7, 6, 5, 4, 3, 2, 1]
+    kicker_choices = [
+        straight_flush << 16,
+        (quad_rank << 16) | (TOP_K[1][all_mask & ~quad_mask] >> 4),
+        (trip_rank << 16) | (full_house_pair << 12),
+        TOP_K[5][flush_mask],
+        straight << 16,
+        (trip_rank << 16) | (TOP_K[2][single_mask] >> 4),
+        (top_pair << 16) | (second_pair << 12)
+        | (TOP_K[1][all_mask & ~_rank_bit(top_pair) & ~_rank_bit(second_pair)] >> 8),
+        (top_pair << 16) | (TOP_K[3][single_mask] >> 4),
+    ]
+
+    category = np.select(conditions, categories, default=0)
+    kickers = np.select(conditions, kicker_choices, default=TOP_K[5][all_mask])
+    return (category << CATEGORY_SHIFT) | kickers
+
+
+def _rank_bit(rank):
+    """
+    Returns the mask bit for each rank, or 0 where the rank is missing (-1).
+    """
+    return np.where(rank >= 0, 1 << np.maximum(rank, 0), 0)
+
+
+def evaluate(card_strs):
+    """
+    Ranks a single hand given as card strings, e.g. ['AC', 'KC', '10H', '5D', '2S', '9C', '9H'].
+    """
+    return int(evaluate_batch(cards_to_array(card_strs)[None, :])[0])
+
+
+def hand_category(scores):
+    """
+    Returns the hand category index (0 = High Card ... 8 = Straight Flush) for each score.
+    """
+    return np.asarray(scores) >> CATEGORY_SHIFT
+
+
+# Benchmark against the per-hand eval7 and PokerPy paths
+if __name__ == "__main__":
+    import eval7
+
+    n_hands = 100_000
+    rng = np.random.default_rng(0)
+    hands = np.argsort(rng.random((n_hands, 52)), axis=1)[:, :7].astype(np.int8)
+
+    start = time.perf_counter()
+    scores = evaluate_batch(hands)
+    numpy_time = time.perf_counter() - start
+
+    eval7_hands = [[eval7_card(c) for c in hand] for hand in hands]
+    start = time.perf_counter()
+    eval7_scores = [eval7.evaluate(hand) for hand in eval7_hands]
+    eval7_time = time.perf_counter() - start
+
+    # Same ordering as eval7 on neighbouring pairs of hands
+    ours = np.sign(np.diff(scores))
+    theirs = np.sign(np.diff(np.array(eval7_scores, dtype=np.int64)))
+    print(f"Ordering agrees with eval7: {np.array_equal(ours, theirs)}")
+
+    print(f"NumPy batch: {n_hands / numpy_time:,.0f} hands/s")
+    print(f"eval7 loop:  {n_hands / eval7_time:,.0f} hands/s")
+
+    try:
+        from PokerPy import Card, get_best_hand
+
+        sample = hands[:10_000]
+        pokerpy_hands = [[Card(pokerpy_str(c)) for c in hand] for hand in sample]
+        start = time.perf_counter()
+        for hand in pokerpy_hands:
+            get_best_hand(hand).hand_heuristic()
+        pokerpy_time = time.perf_counter() - start
+        print(f"PokerPy loop: {len(sample) / pokerpy_time:,.0f} hands/s")
+    except ImportError:
+        print("PokerPy not installed, skipping its benchmark")
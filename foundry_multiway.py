@@ -0,0 +1,183 @@
+import os
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from foundry_cards import card_to_int
+from foundry_evaluator import evaluate_batch
+
+DEFAULT_TRIALS = 20000
+# Spread trials across processes once this many opponents share the simulation
+PARALLEL_MIN_OPPONENTS = 5
+BATCH_TRIALS = 5000  # trials evaluated per NumPy call, to bound memory
+
+_pool = None  # persistent ProcessPoolExecutor, created on first parallel call, see _get_pool
+_pool_owner = None  # pid that created _pool; a forked child must not reuse its parent's pool
+
+
+def _get_pool(processes):
+    """
+    Returns the persistent process pool, (re)creating it when the size changes or after a fork.
+    """
+    global _pool, _pool_owner
+    if _pool is not None and (_pool_owner != os.getpid() or _pool._max_workers != processes):
+        if _pool_owner == os.getpid():
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=processes)
+        _pool_owner = os.getpid()
+    return _pool
+
+
+def shutdown_pool():
+    """
+    Stops the persistent process pool, if this process created one. Safe to call more than once.
+    """
+    global _pool, _pool_owner
+    if _pool is not None and _pool_owner == os.getpid():
+        _pool.shutdown(wait=True, cancel_futures=True)
+    _pool = _pool_owner = None
+
+
+atexit.register(shutdown_pool)
+
+
+def _simulate(hero, board, known, ranges, n_random, trials, seed):
+    """
+    Runs `trials` shared runouts for every player at once and tallies Hero's results.
+
+    Range opponents are dealt one after another, each from the combos of their range that no
+    earlier card blocks, so trials are only lost when a range is completely blocked.
+
+    :return: (sole wins, split pots, split-pot shares, completed trials).
+    """
+    rng = np.random.default_rng(seed)
+    dead = np.array(hero + board + [c for hand in known for c in hand], dtype=np.int64)
+    n_missing = 5 - len(board)
+    wins = ties = shares = done = 0.0
+
+    for start in range(0, trials, BATCH_TRIALS):
+        n = min(BATCH_TRIALS, trials - start)
+
+        # Range-defined opponents: pick a weighted combo per trial among those no card dealt so far blocks
+        used = np.zeros((n, 52), dtype=bool)
+        used[:, dead] = True
+        valid = np.ones(n, dtype=bool)
+        range_hands = []
+        for combos, probabilities in ranges:
+            live = np.where(used[:, combos].any(axis=2), 0.0, probabilities)
+            cumulative = np.cumsum(live, axis=1)
+            valid &= cumulative[:, -1] > 0
+            targets = rng.random(n) * cumulative[:, -1]
+            picks = np.minimum((cumulative <= targets[:, None]).sum(axis=1), len(combos) - 1)
+            hand = combos[picks]
+            np.put_along_axis(used, hand, True, axis=1)
+            range_hands.append(hand)
+        drawn = np.concatenate(range_hands, axis=1) if range_hands else np.zeros((n, 0), dtype=np.int64)
+
+        # Deal the rest of the board and the unknown opponents from what is left of the deck
+        keys = rng.random((n, 52))
+        keys[:, dead] = 2.0
+        np.put_along_axis(keys, drawn, 2.0, axis=1)
+        dealt = np.argsort(keys, axis=1)[:, :n_missing + 2 * n_random]
+
+        full_board = np.concatenate([np.broadcast_to(np.array(board, dtype=np.int64), (n, len(board))),
+                                     dealt[:, :n_missing]], axis=1)
+        hands = [np.broadcast_to(np.array(hero, dtype=np.int64), (n, 2))]
+        hands += [np.broadcast_to(np.array(hand, dtype=np.int64), (n, 2)) for hand in known]
+        hands += range_hands
+        hands += [dealt[:, n_missing + 2 * i:n_missing + 2 * i + 2] for i in range(n_random)]
+
+        scores = evaluate_batch(np.concatenate([
+            np.concatenate([hand, full_board], axis=1) for hand in hands
+        ])).reshape(len(hands), n)[:, valid]
+
+        best = scores.max(axis=0)
+        hero_best = scores[0] == best
+        n_best = (scores == best).sum(axis=0)
+
+        hero_split = hero_best & (n_best > 1)
+
+        wins += (hero_best & (n_best == 1)).sum()
+        ties += hero_split.sum()
+        shares += (hero_split / n_best).sum()
+        done += valid.sum()
+
+    return wins, ties, shares, done
+
+
+def multiway_equity(hero_strs, opponents, board_strs=[], trials=DEFAULT_TRIALS, seed=None, processes=None):
+    """
+    Computes Hero's equity against 2 to 8 opponents from one shared simulation.
+
+    Every trial deals a single runout used by all players, instead of running
+    one pairwise simulation per opponent.
+
+    :param hero_strs: Hero's two cards, as strings like ['AC', '7C'] or card integers.
+    :param opponents: One entry per opponent: a list of two card strings for a known hand,
+                      a (combos, weights) range such as foundry_range_equity.load_range returns,
+                      or None for a random hand.
+    :param board_strs: 0 to 5 community cards, as strings or card integers.
+    :param trials: Number of simulated runouts.
+    :param seed: Optional seed for a reproducible result.
+    :param processes: Worker processes; by default only used for large pots. The pool is kept between
+                      calls, see shutdown_pool.
+    :return: Dict with 'win' (sole wins), 'tie' (any split), 'loss', 'equity' (win plus split shares),
+             and the completed 'samples' with the win rate's standard 'error'.
+    """
+    if not (2 <= len(opponents) <= 8):
+        raise ValueError("Multi-way equity needs 2 to 8 opponents.")
+
+    hero = [card_to_int(s) for s in hero_strs]
+    board = [card_to_int(s) for s in board_strs]
+    known, ranges, n_random = [], [], 0
+    for opponent in opponents:
+        if opponent is None:
+            n_random += 1
+        elif isinstance(opponent, tuple):
+            ranges.append(opponent)
+        else:
+            known.append([card_to_int(s) for s in opponent])
+
+    dead = set(hero + board + [c for hand in known for c in hand])
+    if len(dead) != 2 + len(board) + 2 * len(known):
+        raise ValueError("Duplicate cards among Hero, the known opponents and the board.")
+
+    # Remove range combos blocked by known cards and normalise their weights
+    live_ranges = []
+    for combos, weights in ranges:
+        combos = np.asarray(combos, dtype=np.int64)
+        live = ~np.isin(combos, list(dead)).any(axis=1)
+        live_weights = np.asarray(weights, dtype=float)[live]
+        if not live_weights.any():
+            raise ValueError("An opponent range is completely blocked by known cards.")
+        live_ranges.append((combos[live], live_weights / live_weights.sum()))
+
+    args = (hero, board, known, live_ranges, n_random)
+    if processes is None:
+        processes = os.cpu_count() if len(opponents) >= PARALLEL_MIN_OPPONENTS else 1
+
+    seeds = np.random.SeedSequence(seed).generate_state(max(processes, 1))
+    if processes > 1:
+        chunk = -(-trials // processes)
+        results = list(_get_pool(processes).map(_simulate, *zip(*[args + (chunk, int(s)) for s in seeds])))
+    else:
+        results = [_simulate(*args, trials, int(seeds[0]))]
+
+    wins, ties, shares, done = (sum(r[i] for r in results) for i in range(4))
+    if done == 0:
+        raise ValueError("Opponent ranges conflicted in every trial.")
+
+    win, tie = float(wins / done), float(ties / done)
+    return {"win": win, "tie": tie, "loss": max(0.0, 1.0 - win - tie), "equity": float((wins + shares) / done),
+            "samples": int(done), "error": float((win * (1 - win) / done) ** 0.5)}
+
+
+# Example usage
+if __name__ == "__main__":
+    from foundry_range_equity import load_range
+
+    print(multiway_equity(["AC", "7C"], [["KC", "10H"], None, load_range("btn")], ["QC", "5H", "2C"]))
+    print(multiway_equity(["AC", "AD"], [None] * 8, trials=40000))
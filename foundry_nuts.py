@@ -0,0 +1,96 @@
+from functools import lru_cache
+from itertools import combinations, permutations
+
+import numpy as np
+
+from foundry_board_texture import board_texture
+from foundry_cards import CARD_STRS, card_to_int
+from foundry_evaluator import evaluate_batch
+
+SUIT_PERMUTATIONS = list(permutations(range(4)))
+HOLE_COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.int8)
+
+
+def canonical_board(board):
+    """
+    Relabels suits so every suit-isomorphic board maps to the same sorted tuple.
+
+    :param board: Iterable of card integers.
+    :return: (canonical board tuple, suit permutation that produced it).
+    """
+    best, best_perm = None, None
+    for perm in SUIT_PERMUTATIONS:
+        relabeled = tuple(sorted((c & ~3) | perm[c & 3] for c in board))
+        if best is None or relabeled < best:
+            best, best_perm = relabeled, perm
+    return best, best_perm
+
+
+@lru_cache(maxsize=4096)
+def _ranked_combos(board):
+    """
+    Evaluates every hole card combination on a canonical board in one batch, best first.
+
+    :param board: Canonical board tuple of card integers.
+    :return: (combos array sorted best first, matching scores array).
+    """
+    board_array = np.array(board, dtype=np.int8)
+    live = ~np.isin(HOLE_COMBOS, board_array).any(axis=1)
+    combos = HOLE_COMBOS[live]
+
+    hands = np.concatenate([combos, np.broadcast_to(board_array, (len(combos), len(board)))], axis=1)
+    scores = evaluate_batch(hands)
+    order = np.argsort(-scores, kind="stable")
+    return combos[order], scores[order]
+
+
+def find_nuts(board_strs, top_n=1, dead=()):
+    """
+    Finds the strongest hole card combinations on a board like ['QC', '5H', 'AC'].
+
+    Dry boards (unpaired, no flush or straight possible) are answered straight from
+    the texture: top set is the nuts. Everything else is evaluated once per
+    suit-isomorphic board and cached.
+
+    :param board_strs: List of 3 to 5 cards, as strings or card integers.
+    :param top_n: Number of combinations to return.
+    :param dead: Cards nobody else can hold, such as Hero's hole cards, as strings or card integers.
+    :return: List of (card, card) integer tuples, best first.
+    """
+    board = [card_to_int(s) for s in board_strs]
+    dead = [card_to_int(s) for s in dead]
+    if not (3 <= len(board) <= 5):
+        raise ValueError("Nuts search needs 3 to 5 community cards.")
+
+    if top_n == 1:
+        texture = board_texture(board)
+        if not (texture["paired"] or texture["flush_possible"] or texture["straight_possible"]):
+            top_rank = max(c >> 2 for c in board)
+            top_set = [top_rank * 4 + s for s in range(4) if top_rank * 4 + s not in board + dead]
+            if len(top_set) >= 2:
+                return [tuple(top_set[:2])]
+
+    canonical, perm = canonical_board(board)
+    combos, _ = _ranked_combos(canonical)
+
+    # Back to the real suits, then drop combos holding a dead card
+    inverse = np.array([perm.index(s) for s in range(4)])
+    cards = np.arange(52)
+    combos = ((cards & ~3) | inverse[cards & 3])[combos]
+    if dead:
+        combos = combos[~np.isin(combos, dead).any(axis=1)]
+    return [tuple(int(c) for c in combo) for combo in combos[:top_n]]
+
+
+def combo_to_strs(combo):
+    """
+    Converts a tuple of card integers into card strings like ('AH', 'TH').
+    """
+    return tuple(CARD_STRS[c] for c in combo)
+
+
+# Example usage
+if __name__ == "__main__":
+    print(combo_to_strs(find_nuts(["QC", "5H", "AC"])[0]))
+    print([combo_to_strs(c) for c in find_nuts(["QC", "JC", "10C", "2H"], top_n=3)])
+    print(combo_to_strs(find_nuts(["QC", "5H", "AC"], dead=["AD", "AH"])[0]))
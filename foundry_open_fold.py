@@ -1,11 +1,40 @@
 import json
 import os
 import random
+import time
+import logging
+
+import numpy as np
 
 RANGES_DIR = "ranges"
 VALID_POSITIONS = {"utg", "utg+1", "utg+2", "lj", "hj", "co", "btn", "sb", "bb"}
 
 POKER_RANK_ORDER = "AKQJT98765432"
+RELOAD_CHECK_INTERVAL = 1.0  # seconds between checks of the chart files for edits
+PACKED_RANGES_FILE = "ranges.bin"  # written by foundry_range_pack.py
+STRATEGY_FILE = "strategy.json"
+
+# Charts for pots that are already raised live in ranges/facing/, named
+# <hero>_vs_<villain>_<depth>.json, e.g. co_vs_utg_open.json or any_vs_any_3bet.json
+FACING_DIR = "facing"
+FACING_DEPTHS = {1: "open", 2: "3bet", 3: "4bet"}  # raises Hero is facing -> file name suffix
+ANY_POSITION = "any"
+
+# Used when ranges/strategy.json is missing; the shipped file holds the same values
+DEFAULT_STRATEGY = {
+    # How often each chart letter raises and calls; the rest folds
+    "actions": {"r": {"raise": 1.0}, "s": {"raise": 0.25}, "b": {"raise": 0.25}, "c": {"call": 1.0}, "f": {}},
+    "bb_random_open": 0.15,  # BB opens any hand this often
+    "sb_call": 0.6,  # SB calls instead of raising an 'r' hand this often
+    # Borderline open frequencies are scaled by these while a special hand is on
+    "special_suited_borderline_scale": 0.5,
+    "special_borderline_scale": 0.2,
+}
+MIXED_ACTION = "m"  # chart cells given as explicit frequencies, e.g. {"raise": 0.4, "call": 0.2}
+
+# Decisions draw from this stream; start_decision_session reseeds it so a session can be replayed
+SESSION_RNG = random.Random()
+SESSION_SEED = None
 
 def normalize_hand(hand: str) -> str:
     def rank_value(card):
@@ -25,78 +54,404 @@ def normalize_hand(hand: str) -> str:
 
     raise ValueError(f"INVALID")
 
+def hand_cell(hand: str):
+    """
+    Returns the (row, col) of a hand in the 13x13 chart grid, ranks ordered A..2.
+    Suited hands sit above the diagonal, offsuit hands below it and pairs on it.
+    """
+    normalized = normalize_hand(hand)
+    high, low = sorted((POKER_RANK_ORDER.index(normalized[0]), POKER_RANK_ORDER.index(normalized[1])))
+    if len(normalized) == 3 and normalized[2] == "o":
+        return low, high
+    return high, low
+
+
+def parse_chart_value(value, strategy=DEFAULT_STRATEGY):
+    """
+    Turns one JSON chart value into (action letter, raise frequency, call frequency).
+
+    A value is either an action letter like 'r', or a mixed strategy like {"raise": 0.4, "call": 0.2}.
+    """
+    if isinstance(value, str):
+        if value not in strategy["actions"]:
+            raise ValueError(f"unknown action '{value}'")
+        frequencies = strategy["actions"][value]
+        return value, frequencies.get("raise", 0.0), frequencies.get("call", 0.0)
+
+    if isinstance(value, dict):
+        unknown = set(value) - {"raise", "call"}
+        if unknown:
+            raise ValueError(f"unknown mixed-strategy keys {sorted(unknown)}")
+        raise_freq, call_freq = float(value.get("raise", 0.0)), float(value.get("call", 0.0))
+        if min(raise_freq, call_freq) < 0 or raise_freq + call_freq > 1.0 + 1e-9:
+            raise ValueError(f"frequencies must be between 0 and 1 and sum to at most 1, got {value}")
+        return MIXED_ACTION, raise_freq, call_freq
+
+    raise ValueError(f"unsupported value {value!r}")
+
+
+class RangeStore:
+    """
+    Keeps every position's chart as a 13x13 grid of actions, loaded once and reloaded
+    when its file changes on disk, so lookups never touch the file system.
+
+    Charts come from the packed ranges file when it is at least as new as the JSON chart,
+    and from the JSON chart otherwise. The frequencies behind each action letter come
+    from ranges/strategy.json, which is reloaded the same way.
+    """
+
+    def __init__(self, ranges_dir: str = RANGES_DIR, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.ranges_dir = ranges_dir
+        self.check_interval = check_interval
+        self.charts = {}  # position -> (file mtime, letter grid, {(row, col): (raise, call)} for mixed cells)
+        self.last_check = {}  # position or STRATEGY_FILE -> monotonic time of the last mtime check
+        self.loaded_strategy = None  # (file mtime, strategy dict)
+        self.facing = None  # (newest mtime under ranges/facing/, {(hero, villain, depth): (grid, mixed)})
+
+    def path(self, position: str) -> str:
+        return os.path.join(self.ranges_dir, f"{position}.json")
+
+    def source_mtime(self, position: str) -> float:
+        """Latest edit time of the position's JSON chart and the packed ranges file."""
+        paths = (self.path(position), os.path.join(self.ranges_dir, PACKED_RANGES_FILE))
+        return max(os.path.getmtime(p) for p in paths if os.path.exists(p))
+
+    def due_for_check(self, name: str) -> bool:
+        """True at most once per check_interval for each watched file."""
+        now = time.monotonic()
+        if now - self.last_check.get(name, float("-inf")) < self.check_interval:
+            return False
+        self.last_check[name] = now
+        return True
+
+    def load(self, position: str):
+        """
+        Reads a position's chart into a grid. Hands missing from a JSON chart are None.
+        """
+        mtime = self.source_mtime(position)
+        packed = self.load_packed(position)
+        if packed is not None:
+            grid, mixed = packed
+        else:
+            with open(self.path(position), "r") as file:
+                data = json.load(file)
+
+            grid, mixed = [[None] * 13 for _ in range(13)], {}
+            for hand, value in data.items():
+                row, col = hand_cell(hand)
+                action, raise_freq, call_freq = parse_chart_value(value, self.strategy())
+                grid[row][col] = action
+                if action == MIXED_ACTION:
+                    mixed[row, col] = (raise_freq, call_freq)
+
+        self.charts[position] = (mtime, grid, mixed)
+        return self.charts[position]
+
+    def load_packed(self, position: str):
+        """
+        Returns the position's (grid, mixed cells) from the packed ranges file, or None when
+        that file is missing, lacks the position, or is older than the JSON chart.
+        """
+        packed_path = os.path.join(self.ranges_dir, PACKED_RANGES_FILE)
+        if not os.path.exists(packed_path):
+            return None
+        json_path = self.path(position)
+        if os.path.exists(json_path) and os.path.getmtime(packed_path) < os.path.getmtime(json_path):
+            logging.info(f"{position}.json is newer than {PACKED_RANGES_FILE}, reading the JSON chart")
+            return None
+
+        from foundry_range_pack import PackedRanges
+        try:
+            packed = PackedRanges(packed_path)
+            if position not in packed.positions:
+                return None
+            return packed.grid(position), packed.mixed_cells(position)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read {PACKED_RANGES_FILE}: {e}")
+            return None
+
+    def chart(self, position: str):
+        """
+        Returns (mtime, grid, mixed cells) for a position, loading it on first use and
+        reloading it at most once per check_interval if the file was edited.
+        """
+        chart = self.charts.get(position)
+        if chart is None:
+            if not os.path.exists(self.path(position)) and self.load_packed(position) is None:
+                raise FileNotFoundError(f"No range file found for '{position}' at '{self.path(position)}'.")
+            self.due_for_check(position)
+            return self.load(position)
+
+        if self.due_for_check(position):
+            try:
+                if self.source_mtime(position) != chart[0]:
+                    logging.info(f"Reloading edited range chart: {position}")
+                    return self.load(position)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Keeping the loaded {position} chart, reload failed: {e}")
+        return chart
+
+    def grid(self, position: str):
+        """Returns the 13x13 grid of action letters for a position."""
+        return self.chart(position)[1]
+
+    def strategy(self):
+        """
+        Returns the strategy frequencies from ranges/strategy.json, or DEFAULT_STRATEGY
+        when the file is missing. Edits are picked up like chart edits.
+        """
+        path = os.path.join(self.ranges_dir, STRATEGY_FILE)
+        if self.loaded_strategy is not None and not self.due_for_check(STRATEGY_FILE):
+            return self.loaded_strategy[1]
+
+        try:
+            mtime = os.path.getmtime(path) if os.path.exists(path) else None
+            if self.loaded_strategy is None or self.loaded_strategy[0] != mtime:
+                strategy = DEFAULT_STRATEGY
+                if mtime is not None:
+                    with open(path, "r") as file:
+                        strategy = {**DEFAULT_STRATEGY, **json.load(file)}
+                self.loaded_strategy = (mtime, strategy)
+                self.due_for_check(STRATEGY_FILE)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Keeping the loaded strategy, reading {STRATEGY_FILE} failed: {e}")
+            if self.loaded_strategy is None:
+                self.loaded_strategy = (None, DEFAULT_STRATEGY)
+        return self.loaded_strategy[1]
+
+    def action(self, hand: str, position: str):
+        """
+        Returns the chart action ('r', 's', 'b', 'c', 'f' or 'm' for mixed) for a hand, or None if the chart lacks it.
+        """
+        row, col = hand_cell(hand)
+        return self.grid(position)[row][col]
+
+    def frequencies(self, hand: str, position: str):
+        """
+        Returns the (raise, call) frequencies for a hand; the fold frequency is what remains.
+        """
+        row, col = hand_cell(hand)
+        return self.cell_frequencies(position)[row * 13 + col]
+
+    def cell_frequencies(self, position: str):
+        """
+        Returns the (raise, call) frequencies of all 169 cells, flattened row by row.
+        Cells missing from the chart are (0.0, 0.0).
+        """
+        _, grid, mixed = self.chart(position)
+        actions = self.strategy()["actions"]
+        frequencies = []
+        for row in range(13):
+            for col in range(13):
+                action = grid[row][col]
+                if action == MIXED_ACTION:
+                    frequencies.append(mixed[row, col])
+                else:
+                    cell = actions.get(action, {})
+                    frequencies.append((cell.get("raise", 0.0), cell.get("call", 0.0)))
+        return frequencies
+
+    def facing_mtime(self):
+        """Newest edit time of the facing chart directory and its files, or None if it is missing."""
+        directory = os.path.join(self.ranges_dir, FACING_DIR)
+        if not os.path.isdir(directory):
+            return None
+        return max([os.path.getmtime(directory)] +
+                   [os.path.getmtime(os.path.join(directory, name)) for name in os.listdir(directory)])
+
+    def compile_facing(self):
+        """
+        Reads every facing chart and resolves which one applies to each hero position, villain
+        position and raise depth, so a lookup is one dict access. The most specific chart wins:
+        hero vs villain, then hero vs any, any vs villain, and any vs any.
+        """
+        mtime = self.facing_mtime()
+        charts = {}
+        depths = {suffix: depth for depth, suffix in FACING_DEPTHS.items()}
+        directory = os.path.join(self.ranges_dir, FACING_DIR)
+
+        for name in sorted(os.listdir(directory)) if mtime is not None else []:
+            hero, _, rest = name[:-len(".json")].partition("_vs_")
+            villain, _, suffix = rest.rpartition("_")
+            if not name.endswith(".json") or suffix not in depths:
+                continue
+
+            with open(os.path.join(directory, name), "r") as file:
+                data = json.load(file)
+
+            # Hands a facing chart leaves out are folds
+            grid, mixed = [["f"] * 13 for _ in range(13)], {}
+            for hand, value in data.items():
+                row, col = hand_cell(hand)
+                action, raise_freq, call_freq = parse_chart_value(value, self.strategy())
+                grid[row][col] = action
+                if action == MIXED_ACTION:
+                    mixed[row, col] = (raise_freq, call_freq)
+            charts[hero, villain, depths[suffix]] = (grid, mixed)
+
+        tree = {}
+        for depth in FACING_DEPTHS:
+            for hero in VALID_POSITIONS:
+                for villain in VALID_POSITIONS:
+                    for key in ((hero, villain), (hero, ANY_POSITION), (ANY_POSITION, villain),
+                                (ANY_POSITION, ANY_POSITION)):
+                        if key + (depth,) in charts:
+                            tree[hero, villain, depth] = charts[key + (depth,)]
+                            break
+
+        self.facing = (mtime, tree)
+        return tree
+
+    def facing_tree(self):
+        """Returns the compiled facing tree, recompiling it when a facing chart was edited."""
+        if self.facing is None:
+            self.due_for_check(FACING_DIR)
+            return self.compile_facing()
+
+        if self.due_for_check(FACING_DIR):
+            try:
+                if self.facing_mtime() != self.facing[0]:
+                    logging.info("Reloading edited facing charts")
+                    return self.compile_facing()
+            except (OSError, ValueError) as e:
+                logging.warning(f"Keeping the loaded facing charts, reload failed: {e}")
+        return self.facing[1]
+
+    def facing_frequencies(self, hand: str, hero_position: str, villain_position: str, raises: int):
+        """
+        Returns Hero's (re-raise, call) frequencies for a hand facing `raises` raises with the
+        last one from villain_position, or None if no facing chart covers the spot.
+        """
+        chart = self.facing_tree().get((hero_position, villain_position, min(raises, max(FACING_DEPTHS))))
+        if chart is None:
+            return None
+
+        grid, mixed = chart
+        row, col = hand_cell(hand)
+        action = grid[row][col]
+        if action == MIXED_ACTION:
+            return mixed[row, col]
+        frequencies = self.strategy()["actions"][action]
+        return frequencies.get("raise", 0.0), frequencies.get("call", 0.0)
+
+    def preload(self):
+        """Loads every position's chart, the facing charts and the strategy up front, e.g. at startup."""
+        self.strategy()
+        self.facing_tree()
+        for position in VALID_POSITIONS:
+            try:
+                self.grid(position)
+            except FileNotFoundError:
+                pass
+
+
+RANGE_STORE = RangeStore()
+
+
 def get_range_action(hand: str, position: str) -> str:
     try:
         if position not in VALID_POSITIONS:
             raise ValueError(f"Invalid position '{position}'. Must be one of: {', '.join(sorted(VALID_POSITIONS))}")
 
-        normalized_hand = normalize_hand(hand)
-        filepath = os.path.join(RANGES_DIR, f"{position}.json")
-
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"No range file found for '{position}' at '{filepath}'.")
-
-        with open(filepath, "r") as file:
-            data = json.load(file)
-
-        action = data.get(normalized_hand)
+        action = RANGE_STORE.action(hand, position)
         if action is None:
-            raise KeyError(f"Hand '{hand}' (normalized as '{normalized_hand}') not found in {position} ranges.")
+            raise KeyError(f"Hand '{hand}' (normalized as '{normalize_hand(hand)}') not found in {position} ranges.")
 
         return action
 
     except Exception as e:
         return f"Error: {e}"
 
+def start_decision_session(seed: int = None) -> int:
+    """
+    Reseeds the decision RNG for a new session. Passing a logged seed back in replays
+    the same decisions for the same sequence of hands.
+
+    :return: The seed in use.
+    """
+    global SESSION_SEED
+    SESSION_SEED = seed if seed is not None else int.from_bytes(os.urandom(8), "little")
+    SESSION_RNG.seed(SESSION_SEED)
+    logging.info(f"Preflop decision seed: {SESSION_SEED}")
+    return SESSION_SEED
+
+def borderline_scale(strategy, special_hand_enabled: bool, special_hand_suited: bool) -> float:
+    """How much a special hand shrinks the open frequency of borderline and mixed hands."""
+    if not special_hand_enabled:
+        return 1.0
+    return strategy["special_suited_borderline_scale" if special_hand_suited else "special_borderline_scale"]
+
+def matches_special_hand(normalized_hand: str, special_hand: str, special_hand_suited: bool) -> bool:
+    """True if a normalized hand is the special hand (only its suited form when suited-only is on)."""
+    special_core = normalize_hand(special_hand + "s")[:2]
+    if special_hand_suited:
+        return normalized_hand == special_core + "s"
+    return normalized_hand[:2] == special_core
+
 def should_play_hand(
     hand: str,
     position: str,
     special_hand_enabled: bool = False,
     special_hand: str = "",
-    special_hand_suited: bool = False
+    special_hand_suited: bool = False,
+    rng: random.Random = None,
+    villain_position: str = None,
+    raises: int = 0
 ) -> str:
+    """
+    Suggests a preflop action. With raises and villain_position set, the hand is played from
+    the facing chart for that spot, and a re-raise is named by its size ('3-bet', '4-bet', '5-bet').
+    Spots without a facing chart fall back to the unopened chart.
+    """
     try:
+        rng = rng or SESSION_RNG
+        strategy = RANGE_STORE.strategy()
         normalized_hand = normalize_hand(hand)
 
-        # Big Blind pre-check: 15% open regardless of hand
-        if position == "bb" and random.random() < 0.15:
+        # Facing a raise: play the facing chart for this hero, villain and raise depth
+        if raises > 0 and villain_position:
+            facing = RANGE_STORE.facing_frequencies(hand, position, villain_position, raises)
+            if facing is not None:
+                reraise = f"{min(raises, max(FACING_DEPTHS)) + 2}-bet"
+                if special_hand_enabled and matches_special_hand(normalized_hand, special_hand, special_hand_suited):
+                    return reraise
+                raise_freq, call_freq = facing
+                draw = rng.random()
+                if draw < raise_freq:
+                    return reraise
+                return "call" if draw < raise_freq + call_freq else "fold"
+
+        # Big Blind pre-check: open any hand some of the time
+        if position == "bb" and rng.random() < strategy["bb_random_open"]:
             return "open"
 
         # Special hand override
-        if special_hand_enabled:
-            normalized_special = normalize_hand(special_hand + "s")
-            hand_core = normalized_hand[:2]
-            special_core = normalized_special[:2]
-
-            if special_hand_suited:
-                if normalized_hand == special_core + "s":
-                    return "open"
-            else:
-                if hand_core == special_core:
-                    return "open"
+        if special_hand_enabled and matches_special_hand(normalized_hand, special_hand, special_hand_suited):
+            return "open"
 
         # Get our hand's action
         action = get_range_action(hand, position)
+        if action in ("s", "b", MIXED_ACTION):
+            raise_freq, call_freq = RANGE_STORE.frequencies(hand, position)
 
-        # ✳️ NEW: If special hand would raise and our hand is 's', allow 25% open
+        # ✳️ NEW: If special hand would raise and our hand is 's', open at the chart's frequency
         if special_hand_enabled:
             normalized_special = normalize_hand(special_hand + "s")
             special_action = get_range_action(normalized_special, position)
             if special_action == "r" and action == "s":
-                return "open" if random.random() < 0.25 else "fold"
-
-        # Special frequency adjustment for 's'/'b'
-        if action == "s" or action == "b":
-            if special_hand_enabled and special_hand_suited:
-                return "open" if random.random() < 0.125 else "fold"
-            elif special_hand_enabled and not special_hand_suited:
-                return "open" if random.random() < 0.05 else "fold"
-            else:
-                return "open" if random.random() < 0.25 else "fold"
-
-        # SB r becomes call 60% of time
+                return "open" if rng.random() < raise_freq else "fold"
+
+        # Borderline and mixed hands play at their chart frequencies, less often with a special hand
+        if action in ("s", "b", MIXED_ACTION):
+            open_freq = raise_freq * borderline_scale(strategy, special_hand_enabled, special_hand_suited)
+            draw = rng.random()
+            if draw < open_freq:
+                return "open"
+            return "call" if draw < open_freq + call_freq else "fold"
+
+        # SB r becomes a call some of the time
         if action == "r" and position == "sb":
-            return "call" if random.random() < 0.60 else "open"
+            return "call" if rng.random() < strategy["sb_call"] else "open"
 
         # BB never folds → return check instead
         if action == "f" and position == "bb":
@@ -104,6 +459,8 @@ def should_play_hand(
 
         if action == "r":
             return "open"
+        elif action == "c":
+            return "call"
         elif action == "f":
             return "fold"
         else:
@@ -112,6 +469,121 @@ def should_play_hand(
     except Exception as e:
         return f"Error: {e}"
 
+def _seeded_uniforms(seeds, stream: int):
+    """
+    Turns each seed into a uniform draw in [0, 1) with SplitMix64, so every decision in a
+    batch gets its own reproducible randomness without a Python-level RNG per hand.
+    """
+    with np.errstate(over="ignore"):
+        z = seeds.astype(np.uint64) * np.uint64(2) + np.uint64(stream) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def hand_cells(hands):
+    """
+    Maps many hands to flat 13x13 grid indexes (row * 13 + col, see hand_cell).
+
+    :param hands: Hand strings like 'AKs', or an (N, 2) array of foundry_cards card integers.
+    """
+    if isinstance(hands, np.ndarray) and hands.ndim == 2:
+        cards = hands.astype(np.int64)
+        indexes = 12 - (cards >> 2)  # rank order A..2, as in POKER_RANK_ORDER
+        high, low = indexes.min(axis=1), indexes.max(axis=1)
+        offsuit = ((cards[:, 0] & 3) != (cards[:, 1] & 3)) & (high != low)
+        return np.where(offsuit, low * 13 + high, high * 13 + low)
+
+    unique, inverse = np.unique(np.asarray(hands, dtype=str), return_inverse=True)
+    cells = np.array([row * 13 + col for row, col in map(hand_cell, unique)], dtype=np.int64)
+    return cells[inverse]
+
+
+def should_play_hands(
+    hands,
+    positions,
+    seeds=None,
+    special_hand_enabled: bool = False,
+    special_hand: str = "",
+    special_hand_suited: bool = False
+):
+    """
+    Batch version of should_play_hand: decides many hands at once with array operations.
+
+    :param hands: Hand strings like 'AKs', or an (N, 2) array of card integers.
+    :param positions: One position per hand, or a single position for all of them.
+    :param seeds: Per-hand integer seeds, a single int (hand i uses seed + i), or None to draw
+                  them all at once from the session RNG. The same seed always gives the same decision.
+    :return: Array of decisions ('open', 'fold', 'call', 'check' or an 'Error: ...' string).
+    """
+    cells = hand_cells(hands)
+    n = len(cells)
+
+    position_names = np.broadcast_to(np.asarray(positions, dtype=str), (n,))
+    names, position_ids = np.unique(position_names, return_inverse=True)
+    for name in names:
+        if name not in VALID_POSITIONS:
+            return np.full(n, f"Error: Invalid position '{name}'.", dtype=object)
+
+    # One row of action letters per position in the batch; 0 marks hands missing from a chart
+    try:
+        charts = np.array([[ord(a) if a else 0 for row in RANGE_STORE.grid(name) for a in row] for name in names],
+                          dtype=np.uint8)
+    except FileNotFoundError as e:
+        return np.full(n, f"Error: {e}", dtype=object)
+    actions = charts[position_ids, cells]
+    strategy = RANGE_STORE.strategy()
+    frequencies = np.array([RANGE_STORE.cell_frequencies(name) for name in names])  # (positions, 169, 2)
+    raise_freq, call_freq = frequencies[position_ids, cells, 0], frequencies[position_ids, cells, 1]
+
+    if seeds is None:
+        seeds = np.random.default_rng(SESSION_RNG.getrandbits(64)).integers(0, 2 ** 63, n)
+    elif np.ndim(seeds) == 0:
+        seeds = int(seeds) + np.arange(n)
+    seeds = np.asarray(seeds)
+    bb_draw, action_draw = _seeded_uniforms(seeds, 0), _seeded_uniforms(seeds, 1)
+
+    is_bb, is_sb = position_names == "bb", position_names == "sb"
+    r, s, b, c, f, m = (np.uint8(ord(letter)) for letter in "rsbcf" + MIXED_ACTION)
+
+    decisions = np.full(n, "", dtype=object)
+    decided = np.zeros(n, dtype=bool)
+
+    def decide(mask, value):
+        mask = mask & ~decided
+        decisions[mask] = value if np.ndim(value) == 0 else value[mask]
+        decided[:] |= mask
+
+    decide(is_bb & (bb_draw < strategy["bb_random_open"]), "open")
+
+    if special_hand_enabled:
+        try:
+            special_row, special_col = hand_cell(special_hand + "s")
+        except Exception as e:
+            return np.full(n, f"Error: {e}", dtype=object)
+        special_cell = special_row * 13 + special_col
+        if special_hand_suited:
+            special_match = (cells == special_cell) & (special_row != special_col)
+        else:
+            special_match = (cells == special_cell) | (cells == special_col * 13 + special_row)
+        decide(special_match, "open")
+
+        special_raises = charts[position_ids, special_cell] == r
+        decide(special_raises & (actions == s), np.where(action_draw < raise_freq, "open", "fold"))
+
+    open_freq = raise_freq * borderline_scale(strategy, special_hand_enabled, special_hand_suited)
+    decide((actions == s) | (actions == b) | (actions == m),
+           np.where(action_draw < open_freq, "open", np.where(action_draw < open_freq + call_freq, "call", "fold")))
+    decide((actions == r) & is_sb, np.where(action_draw < strategy["sb_call"], "call", "open"))
+    decide((actions == f) & is_bb, "check")
+    decide(actions == r, "open")
+    decide(actions == c, "call")
+    decide(actions == f, "fold")
+    decide(np.ones(n, dtype=bool), "Error: Hand has no chart action.")
+    return decisions
+
+
 # 🧪 Test
 if __name__ == "__main__":
     test_cases = [
@@ -121,3 +593,12 @@ if __name__ == "__main__":
     for hand, pos, special_on, special_hand, suited_only in test_cases:
         result = should_play_hand(hand, pos, special_on, special_hand, suited_only)
         print(f"{hand} in {pos.upper()} → {result}")
+
+    # Batch decisions: a million random hands in random positions
+    batch_rng = np.random.default_rng(0)
+    batch_hands = np.argsort(batch_rng.random((1000000, 52)), axis=1)[:, :2]
+    batch_positions = batch_rng.choice(sorted(VALID_POSITIONS), 1000000)
+    start = time.perf_counter()
+    batch_decisions = should_play_hands(batch_hands, batch_positions, seeds=0)
+    print(f"1,000,000 batch decisions in {time.perf_counter() - start:.2f}s:",
+          dict(zip(*np.unique(batch_decisions.astype(str), return_counts=True))))
@@ -13,6 +13,10 @@ from foundry_open_fold import *
 from foundry_calculator import *
 from foundry_bet_sizer import *
 from foundry_tracker import *
+from foundry_equity_worker import EquityWorker
+from foundry_nuts import find_nuts
+from foundry_positions import table_layout
+from foundry_cards import parse_cards, parse_condensed, condense, card_str, hand_class, rank_of, suit_of, RANKS
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,7 +30,7 @@ GLOBAL_STATE = {
     "special_hand_enabled": False,
     "special_hand_value": "",
     "suited_only": False,
-    "hero_hand": "",
+    "hero_hand": (),  # card integers, see foundry_cards
     "raises": 0,
     "hero_position": "",
     "button_seat": None,
@@ -37,8 +41,11 @@ GLOBAL_STATE = {
     "calculator_input": "",
     "top_top": False,
     "nuts": False,
+    "villain_range": "",
     "selected_player": "",
     "community_cards": "",
+    "table_layout": None,  # foundry_positions.TableLayout for the current hand, set by process_players
+    "board_cards": (),  # community_cards parsed into card integers
     "stats": {
         "VPIP": "0.0",
         "PFR": "0.0",
@@ -49,9 +56,13 @@ GLOBAL_STATE = {
     },
     "win_percent": "0.00",
     "tie_percent": "0.00",
+    "outs": "-",
     "suggestion": "FOLD",
     "spr": "0.0",
-    "bet_size": "0"
+    "bet_size": "0",
+    "ev_sizing": False,
+    "hero_equity": None,  # win + tie / 2 from the latest calculator result, None while one is pending
+    "bet_ev": "-"
 }
 
 class FoundryOverlay(QMainWindow):
@@ -66,10 +77,10 @@ class FoundryOverlay(QMainWindow):
 
         self.last_suggestion_args = None
         self.last_revealed_hands = {}
-        self.last_villain_bet = 0
-        self.last_board_length = 0
-        self.last_button_seat = None
-        self.last_total_bet = 0
+        # Table readings are pushed in as they arrive; polls where none changed skip the sizer entirely
+        self.bet_sizer = BetSizerState(self.load_player_stats)
+        # Preflop raise depth is counted as the top bet rises between polls, so it survives folds
+        self.preflop_sequence = {"hand": None, "top_bet": 0.0, "raises": 0}
 
         screen = QApplication.primaryScreen().geometry()
         screen_width, screen_height = screen.width(), screen.height()
@@ -217,6 +228,7 @@ class FoundryOverlay(QMainWindow):
                 self.nuts_checkbox.setChecked(False)
                 self.top_top_checkbox.blockSignals(False)
                 self.nuts_checkbox.blockSignals(False)
+                self.clear_range_selector()
             self.on_calculator_change()  # ✅ Added
 
         self.calculator_input.textChanged.connect(on_calculator_input_changed)
@@ -235,6 +247,7 @@ class FoundryOverlay(QMainWindow):
                 self.calculator_input.blockSignals(True)
                 self.calculator_input.setText("")
                 self.calculator_input.blockSignals(False)
+                self.clear_range_selector()
             self.on_calculator_change()  # ✅ Added
 
         self.top_top_checkbox.stateChanged.connect(on_top_top_checked)
@@ -253,15 +266,40 @@ class FoundryOverlay(QMainWindow):
                 self.calculator_input.blockSignals(True)
                 self.calculator_input.setText("")
                 self.calculator_input.blockSignals(False)
+                self.clear_range_selector()
             self.on_calculator_change()
 
         self.nuts_checkbox.stateChanged.connect(on_nuts_checked)
 
+        # Villain range selector
+        self.range_selector = QComboBox()
+        self.range_selector.addItems(["", "utg", "utg+1", "utg+2", "lj", "hj", "co", "btn", "sb", "bb"])
+        self.range_selector.setToolTip("Villain range")
+        self.range_selector.setStyleSheet("font-size: 16px; text-align: center;")
+
+        def on_range_selected(position):
+            GLOBAL_STATE["villain_range"] = position
+            if position:
+                for checkbox in (self.top_top_checkbox, self.nuts_checkbox):
+                    checkbox.blockSignals(True)
+                    checkbox.setChecked(False)
+                    checkbox.blockSignals(False)
+                GLOBAL_STATE["top_top"] = GLOBAL_STATE["nuts"] = False
+                self.calculator_input.blockSignals(True)
+                self.calculator_input.setText("")
+                self.calculator_input.blockSignals(False)
+            self.on_calculator_change()
+
+        self.range_selector.currentTextChanged.connect(on_range_selected)
+
         calculator_layout.addWidget(self.calculator_input)
         calculator_layout.addWidget(self.top_top_checkbox)
         calculator_layout.addWidget(self.nuts_checkbox)
+        calculator_layout.addWidget(self.range_selector)
         calculator_layout.addLayout(self.create_sizer_row("WIN %:", GLOBAL_STATE["win_percent"]))
         calculator_layout.addLayout(self.create_sizer_row("TIE %:", GLOBAL_STATE["tie_percent"]))
+        calculator_layout.addLayout(self.create_sizer_row("OUTS:", GLOBAL_STATE["outs"]))
+        self.dynamic_labels["outs"].setWordWrap(True)
         open_fold_layout.addLayout(self.create_sizer_row("SUGGESTION:", GLOBAL_STATE["suggestion"]))
         button_layout_left.addWidget(calculator_container, 1)
 
@@ -270,6 +308,13 @@ class FoundryOverlay(QMainWindow):
         bet_sizer_container, bet_sizer_layout = create_section("Bet Sizer", sizer_text)
         bet_sizer_layout.addLayout(self.create_sizer_row("SPR:", GLOBAL_STATE["spr"]))
         bet_sizer_layout.addLayout(self.create_sizer_row("Bet Size:", GLOBAL_STATE["bet_size"]))
+        bet_sizer_layout.addLayout(self.create_sizer_row("Bet EV:", GLOBAL_STATE["bet_ev"]))
+
+        self.ev_sizing_checkbox = QCheckBox("EV Sizing")
+        self.ev_sizing_checkbox.setStyleSheet("font-size: 16px; text-align: center;")
+        self.ev_sizing_checkbox.stateChanged.connect(lambda state: GLOBAL_STATE.update({"ev_sizing": state == Qt.CheckState.Checked.value}))
+        self.ev_sizing_checkbox.stateChanged.connect(lambda state: self.bet_sizer.update(ev_sizing=state == Qt.CheckState.Checked.value))
+        bet_sizer_layout.addWidget(self.ev_sizing_checkbox)
         button_layout_right.addWidget(bet_sizer_container, 1)
 
         with open('./how_to_use/tracker.txt', 'r', encoding='utf-8') as f:
@@ -300,6 +345,14 @@ class FoundryOverlay(QMainWindow):
         layout.addLayout(button_layout_right, 1)
         layout.setContentsMargins(5, 5, 5, 5)
 
+        # Equity runs in worker processes so simulations never block the UI thread
+        self.equity_worker = EquityWorker()
+        self.equity_worker.result_ready.connect(self.on_equity_result)
+
+        # Open-fold charts are read once here; edits to ranges/ are picked up while running
+        RANGE_STORE.preload()
+        start_decision_session()  # the seed is logged so a session's suggestions can be replayed
+
         # Polling Timer
         self.timer = QTimer()
         self.timer.timeout.connect(self.poll_game_state)
@@ -340,6 +393,7 @@ class FoundryOverlay(QMainWindow):
         try:
             stack = float(result.replace(',', '')) if result else 0.0
             GLOBAL_STATE["hero_stack"] = stack
+            self.bet_sizer.update(hero_stack=stack)
         except Exception as e:
             logging.error(f"Error parsing hero stack: {e}")
 
@@ -350,6 +404,7 @@ class FoundryOverlay(QMainWindow):
         self.calculator_input.setEnabled(False)
         self.top_top_checkbox.setEnabled(False)
         self.nuts_checkbox.setEnabled(False)
+        self.range_selector.setEnabled(False)
         self.player_selector.setEnabled(False)
 
     def enable_modules(self):
@@ -359,6 +414,7 @@ class FoundryOverlay(QMainWindow):
         self.calculator_input.setEnabled(True)
         self.top_top_checkbox.setEnabled(True)
         self.nuts_checkbox.setEnabled(True)
+        self.range_selector.setEnabled(True)
         self.player_selector.setEnabled(True)
 
     def get_big_blind_js(self):
@@ -448,6 +504,7 @@ class FoundryOverlay(QMainWindow):
     def handle_button_seat(self, seat_number):
         if seat_number is not None:
             GLOBAL_STATE["button_seat"] = seat_number
+            self.bet_sizer.update(button_seat=seat_number)
             #logging.info(f"Button is at seat {seat_number}")
         else:
             logging.warning("Could not determine button seat.")
@@ -467,12 +524,22 @@ class FoundryOverlay(QMainWindow):
         except Exception as e:
             logging.error(f"Failed to load stats for {name}: {e}")
 
+    def load_player_stats(self, name):
+        """Returns one player's entry from player_stats.json, or None if they have no stats yet."""
+        try:
+            with open('./player_data/player_stats.json', 'r') as f:
+                return json.load(f)["players"].get(name)
+        except Exception as e:
+            logging.error(f"Failed to load stats for {name}: {e}")
+            return None
+
     def handle_active_players(self, players):
         try:
             if not isinstance(players, list):
                 return
 
             GLOBAL_STATE["active_players"] = players
+            self.bet_sizer.update(players=players)
 
             stats_path = "./player_data/player_stats.json"
             player_stats = {"players": {}}
@@ -547,270 +614,189 @@ class FoundryOverlay(QMainWindow):
             except Exception as e:
                 logging.error(f"Error extracting pot size: {e}")
                 GLOBAL_STATE["pot_size"] = 0.0
+            self.bet_sizer.update(pot_size=GLOBAL_STATE["pot_size"])
 
         self.browser.page().runJavaScript(js, handle_pot_size)
 
     def handle_big_blind_result(self, result):
         if result is not None:
             GLOBAL_STATE["big_blind"] = float(result)
+            self.bet_sizer.update(big_blind=GLOBAL_STATE["big_blind"])
            # print(f"Big Blind set to: {GLOBAL_STATE['big_blind']}")
         else:
             logging.warning("Big Blind value not found.")
 
     def update_bet_sizer(self):
-        # --- Safe expand helper ---
-        VALID_RANKS = {"2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"}
-        VALID_SUITS = {"C", "D", "H", "S"}
-
-        def expand(card_str):
-            if len(card_str) == 3 and card_str.startswith("10"):
-                rank = "10"
-                suit = card_str[2]
-            elif len(card_str) == 2:
-                rank = '10' if card_str[0] == 'T' else card_str[0]
-                suit = card_str[1]
-            else:
-                return None
-            rank = rank.upper()
-            suit = suit.upper()
-            if rank not in VALID_RANKS or suit not in VALID_SUITS:
-                return None
-            return rank + suit
-
-        # --- Parse board ---
-        board_raw = GLOBAL_STATE.get("community_cards", "").upper()
-        if len(board_raw) % 2 != 0:
-            return
-
-        board_strs = [expand(board_raw[i:i + 2]) for i in range(0, len(board_raw), 2)]
-        if any(card is None for card in board_strs):
+        sizing = self.bet_sizer.suggestion()
+        GLOBAL_STATE["raises"] = self.bet_sizer.raises
+        GLOBAL_STATE["in_position"] = self.bet_sizer.in_position
+        if sizing is None:
             return
 
-        board = [Card(s) for s in board_strs]
-        board_length = len(board)
-        street = "preflop" if board_length == 0 else "postflop"
-
-        hero_stack = GLOBAL_STATE.get('hero_stack', 0.0)
-        active_players = GLOBAL_STATE.get("active_players", [])
-        non_hero_players = [p for p in active_players if not p.get("is_hero")]
-        villain_stack = min((p.get("stack", float("inf")) for p in non_hero_players), default=0)
-
-        pot_size = GLOBAL_STATE.get("pot_size", 0)
-        big_blind = GLOBAL_STATE["big_blind"]
-        last_villain_bet = max((p.get("last_bet", 0) for p in non_hero_players), default=0)
-        if last_villain_bet <= big_blind:
-            last_villain_bet = 0
-
-        multiway = len(active_players) > 2
-        last_bet = max((p.get("last_bet", 0) for p in active_players), default=0)
-
-        current_board_length = len(GLOBAL_STATE.get("community_cards", ""))
-        current_button_seat = GLOBAL_STATE.get("button_seat", None)
-        current_villain_bet = last_villain_bet
-
-        if current_board_length != self.last_board_length or current_button_seat != self.last_button_seat:
-            GLOBAL_STATE["raises"] = 0
-        elif last_bet > getattr(self, "last_total_bet", 0):
-            GLOBAL_STATE["raises"] += 1
-
-        self.last_total_bet = last_bet
-        self.last_villain_bet = current_villain_bet
-        self.last_board_length = current_board_length
-        self.last_button_seat = current_button_seat
-        raises = GLOBAL_STATE["raises"]
-
-        postflop_street = (
-            "N/A" if board_length == 0
-            else "flop" if board_length == 3
-            else "turn" if board_length == 4
-            else "river" if board_length >= 5
-            else "unknown"
-        )
-
-        position_order = ["sb", "bb", "utg-1", "utg", "utg+1", "utg+2", "lj", "hj", "co", "btn"]
-        hero_position_str = GLOBAL_STATE.get("hero_position", "").lower()
-        hero_position = position_order.index(hero_position_str) + 1 if hero_position_str in position_order else 1
-
-        hero_seat = next((p.get("seat") for p in active_players if p.get("is_hero")), None)
-        villain = max(non_hero_players, key=lambda p: p.get("last_bet", 0), default=None)
-        button_seat = GLOBAL_STATE.get("button_seat")
-
-        if hero_seat and villain and button_seat:
-            villain_seat = villain["seat"]
-            seat_order = [(button_seat + i - 1) % 10 + 1 for i in range(1, 11)]
-            hero_index = seat_order.index(hero_seat)
-            villain_index = seat_order.index(villain_seat)
-            GLOBAL_STATE["in_position"] = hero_index > villain_index
-        else:
-            GLOBAL_STATE["in_position"] = False
-
-        args = (
-            street, hero_stack, villain_stack, pot_size, raises, last_bet,
-            big_blind, multiway, postflop_street, hero_position, GLOBAL_STATE["in_position"]
-        )
-
-        if getattr(self, "last_bet_sizer_args", None) != args:
-            spr, bet_size = calculate_spr_and_bet(*args)
-            GLOBAL_STATE["spr"] = f"{spr:.2f}"
-            GLOBAL_STATE["bet_size"] = bet_size
-            self.last_bet_sizer_args = args
-            self.update_dynamic_labels()
-            print(f'📏 Bet Sizer Updated: SPR={spr:.2f}, Bet Size={bet_size}')
+        GLOBAL_STATE["spr"] = f"{sizing['spr']:.2f}"
+        # When EV sizing prefers the passive line, name it instead of showing a bet of 0
+        GLOBAL_STATE["bet_size"] = sizing["bet_size"] if sizing["action"] == "bet" else sizing["action"].upper()
+        GLOBAL_STATE["bet_ev"] = sizing["bet_ev"]
+        self.update_dynamic_labels()
+        print(f'📏 Bet Sizer Updated: SPR={sizing["spr"]:.2f}, Bet Size={sizing["bet_size"]}')
 
     def on_calculator_change(self):
         try:
-            # --- Safe expand helper ---
-            VALID_RANKS = {"2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"}
-            VALID_SUITS = {"C", "D", "H", "S"}
-
-            def expand(card_str):
-                if len(card_str) == 3 and card_str.startswith("10"):
-                    rank = "10"
-                    suit = card_str[2]
-                elif len(card_str) == 2:
-                    rank = '10' if card_str[0] == 'T' else card_str[0]
-                    suit = card_str[1]
-                else:
-                    return None
-                rank = rank.upper()
-                suit = suit.upper()
-                if rank not in VALID_RANKS or suit not in VALID_SUITS:
-                    return None
-                return rank + suit
-
-            # --- Parse board ---
-            board_raw = GLOBAL_STATE.get("community_cards", "").upper()
-            if len(board_raw) % 2 != 0:
-                logging.warning(f"Invalid community card string: '{board_raw}'")
-                return
-
-            board_strs = [expand(board_raw[i:i + 2]) for i in range(0, len(board_raw), 2)]
-
-            if any(card is None for card in board_strs):
-                logging.warning(f"Invalid board cards: {board_strs}")
-                GLOBAL_STATE["win_percent"] = "0.00"
-                GLOBAL_STATE["tie_percent"] = "0.00"
-                self.update_dynamic_labels()
-                return
-
-            board = [Card(s) for s in board_strs]
+            board = list(GLOBAL_STATE.get("board_cards", ()))
+            hero = GLOBAL_STATE.get("hero_hand", ())
 
             # --- Suit setup for override logic ---
-            suits_on_board = [s[-1] for s in board_strs if s]
-            all_suits = ["C", "D", "H", "S"]
+            suits_on_board = [suit_of(c) for c in board]
+            all_suits = range(4)
             suit_counts = {s: suits_on_board.count(s) for s in all_suits}
-            least_used_suits = sorted(suit_counts.items(), key=lambda x: x[1])
-            min_count = least_used_suits[0][1]
-            least_suits = [s for s, count in least_used_suits if count == min_count]
+            dead = set(board) | set(hero)  # override hands may not reuse the board or Hero's cards
 
-            def pick_least_used_suit(exclude=None):
+            def pick_least_used_suit(ranks, exclude=()):
+                # A suit where every rank is still live, preferring suits the board uses least
                 import random
-                choices = [s for s in least_suits if s != exclude] if exclude else least_suits
-                return random.choice(choices) if choices else random.choice(all_suits)
+                choices = [s for s in all_suits
+                           if s not in exclude and all(rank * 4 + s not in dead for rank in ranks)]
+                if not choices:
+                    raise ValueError(f"no live suit for ranks {ranks}")
+                fewest = min(suit_counts[s] for s in choices)
+                return random.choice([s for s in choices if suit_counts[s] == fewest])
+
+            ace_rank, king_rank = RANKS.index("A"), RANKS.index("K")
+            ace, king = ace_rank * 4, king_rank * 4  # add a suit index to get a card
 
-            villain_strs = None  # default
+            def pocket_aces():
+                first = pick_least_used_suit([ace_rank])
+                return [ace + first, ace + pick_least_used_suit([ace_rank], exclude=(first,))]
+
+            villain = None  # default
+            villain_range = None
 
             # --- Nuts override ---
             if self.nuts_checkbox.isChecked():
                 logging.info("Nuts mode enabled for villain")
 
-                if board_strs:
+                if board:
                     try:
-                        best_hole = best_possible_hole_cards(board_strs)
-                        if best_hole:
-                            villain_strs = [best_hole[0].__str__().upper(), best_hole[1].__str__().upper()]
-                            logging.info(f"Best possible villain hole cards: {villain_strs}")
-                        else:
-                            raise ValueError("best_hole was None")
+                        nuts = find_nuts(board, dead=hero)
+                        if not nuts:
+                            raise ValueError("no nut combo found")
+                        villain = list(nuts[0])
+                        logging.info(f"Best possible villain hole cards: {condense(villain)}")
                     except Exception as e:
                         logging.warning(f"Nuts fallback due to error: {e}")
-                        villain_strs = [
-                            'A' + pick_least_used_suit(),
-                            'A' + pick_least_used_suit()
-                        ]
+                        villain = pocket_aces()
                 else:
-                    villain_strs = [
-                        'A' + pick_least_used_suit(),
-                        'A' + pick_least_used_suit()
-                    ]
-                logging.info(f"Overriding villain hand with NUTS: {villain_strs}")
+                    villain = pocket_aces()
+                logging.info(f"Overriding villain hand with NUTS: {condense(villain)}")
 
 
             # --- Top-Top override ---
             elif self.top_top_checkbox.isChecked():
                 logging.info("Top-Top mode enabled for villain")
 
-                if board_strs:
-                    rank_order = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-                    board_ranks = [card[:-1] for card in board_strs]
-
-                    if "A" in board_ranks:
-                        chosen_suit = pick_least_used_suit()
-                        villain_strs = [
-                            'A' + chosen_suit,
-                            'K' + chosen_suit
-                        ]
-                        logging.info(f"Top-Top override with AK suited: {villain_strs}")
+                if board:
+                    board_ranks = [rank_of(c) for c in board]
+
+                    if ace_rank in board_ranks:
+                        try:
+                            chosen_suit = pick_least_used_suit([ace_rank, king_rank])
+                            villain = [ace + chosen_suit, king + chosen_suit]
+                        except ValueError:  # no suit has both cards live, so the AK is offsuit
+                            villain = [ace + pick_least_used_suit([ace_rank]), king + pick_least_used_suit([king_rank])]
+                        logging.info(f"Top-Top override with AK: {condense(villain)}")
                     else:
-                        top_rank = max(board_ranks, key=lambda r: rank_order.index(r))
-                        villain_strs = [
-                            'A' + pick_least_used_suit(),
-                            top_rank + pick_least_used_suit(exclude='A')
-                        ]
-                        logging.info(f"Top-Top override with A + top board rank: {villain_strs}")
+                        top_rank = max(board_ranks)
+                        villain = [ace + pick_least_used_suit([ace_rank]),
+                                   top_rank * 4 + pick_least_used_suit([top_rank])]
+                        logging.info(f"Top-Top override with A + top board rank: {condense(villain)}")
                 else:
-                    villain_strs = [
-                        'A' + pick_least_used_suit(),
-                        'A' + pick_least_used_suit()
-                    ]
-                    logging.info(f"Top-Top override default AA: {villain_strs}")
+                    villain = pocket_aces()
+                    logging.info(f"Top-Top override default AA: {condense(villain)}")
+
+            # --- Villain range override ---
+            elif GLOBAL_STATE.get("villain_range"):
+                villain_range = GLOBAL_STATE["villain_range"]
+                logging.info(f"Villain range: {GLOBAL_STATE['villain_range']}")
 
             # --- Manual calculator input fallback ---
-            if villain_strs is None:
-                raw = GLOBAL_STATE.get("calculator_input", "").upper()
+            if villain is None and villain_range is None:
+                raw = GLOBAL_STATE.get("calculator_input", "")
                 if len(raw) != 4:
                     logging.warning(f"Invalid calculator input length: '{raw}'")
+                    self.discard_equity()
                     return
 
-                v1, v2 = raw[:2], raw[2:4]
-                villain_strs = [expand(v1), expand(v2)]
-                logging.info(f"Villain strings from input: {villain_strs}")
+                villain = parse_condensed(raw)
+                if villain is None:
+                    logging.warning(f"Invalid villain card detected: '{raw}'")
+                    self.discard_equity()
+                    GLOBAL_STATE["win_percent"] = "0.00"
+                    GLOBAL_STATE["tie_percent"] = "0.00"
+                    self.update_dynamic_labels()
+                    return
+                logging.info(f"Villain cards from input: {condense(villain)}")
 
-            # --- Final validation ---
-            if None in villain_strs:
-                logging.warning(f"Invalid villain card detected: {villain_strs}")
-                GLOBAL_STATE["win_percent"] = "0.00"
-                GLOBAL_STATE["tie_percent"] = "0.00"
-                self.update_dynamic_labels()
+            # --- Hero cards ---
+            if len(hero) != 2:
+                logging.warning(f"Invalid hero_hand in GLOBAL_STATE: '{hero}'")
+                self.discard_equity()
                 return
 
-            villain = [Card(s) for s in villain_strs]
+            # --- Evaluation (runs in the equity worker, result arrives in on_equity_result) ---
+            opponents = [p for p in GLOBAL_STATE.get("active_players", []) if not p.get("is_hero")]
+            self.discard_equity()
+            self.equity_worker.submit({
+                "hero": list(hero),
+                "villain": villain,
+                "villain_range": villain_range,
+                "opponents": max(len(opponents), 1),
+                "board": board,
+            })
+            print("calculator change")
 
-            # --- Hero parsing ---
-            hero_cards = GLOBAL_STATE.get("hero_hand", [])
-            if not isinstance(hero_cards, list) or len(hero_cards) != 2:
-                logging.warning(f"Invalid hero_hand in GLOBAL_STATE: '{hero_cards}'")
-                return
+        except Exception as e:
+            logging.error(f"Error in on_calculator_change: {e}")
+            self.discard_equity()
 
-            hero_strs = [expand(hero_cards[0]), expand(hero_cards[1])]
-            if None in hero_strs:
-                logging.warning(f"Invalid hero cards: {hero_strs}")
-                return
+    def discard_equity(self):
+        # Drops any result still in flight and forgets the last equity, so the bet sizer never sees a stale one
+        self.equity_worker.invalidate()
+        GLOBAL_STATE["hero_equity"] = None
+        self.bet_sizer.update(hero_equity=None)
 
-            hero = [Card(s) for s in hero_strs]
+    def on_equity_result(self, request_id, equity):
+        if "error" in equity:
+            logging.error(f"Equity worker error: {equity['error']}")
+            return
 
-            # --- Evaluation ---
-            win = get_hero_win_rate(hero, villain, board)
-            tie = get_hero_tie_rate(hero, villain, board)
+        GLOBAL_STATE["win_percent"] = f"{equity['win'] * 100:.2f}"
+        GLOBAL_STATE["tie_percent"] = f"{equity['tie'] * 100:.2f}"
+        GLOBAL_STATE["hero_equity"] = equity["win"] + equity["tie"] / 2
+        self.bet_sizer.update(hero_equity=GLOBAL_STATE["hero_equity"])
+        self.show_outs(equity)
+        self.update_dynamic_labels()
+
+    def show_outs(self, equity):
+        outs_label = self.dynamic_labels["outs"]
+        if "outs" not in equity:
+            GLOBAL_STATE["outs"] = "-"
+            outs_label.setToolTip("")
+            return
 
-            GLOBAL_STATE["win_percent"] = f"{win * 100:.2f}"
-            GLOBAL_STATE["tie_percent"] = f"{tie * 100:.2f}"
+        # Outs belong to whoever is behind; level hands show the cards that break the tie
+        owner = {1: "Villain", 0: "Either", -1: "Hero"}[equity["leader"]]
+        outs = sorted(equity["outs"], reverse=True)
+        GLOBAL_STATE["outs"] = f"{owner} {len(outs)}: {' '.join(card_str(c) for c in outs)}" if outs else "None"
 
-            self.update_dynamic_labels()
-            print("calculator change")
+        # Hover for Hero's win % after every possible next card, best first
+        by_card = sorted(equity["cards"].items(), key=lambda item: item[1]["win"], reverse=True)
+        outs_label.setToolTip("\n".join(f"{card_str(card)}: {result['win'] * 100:.1f}%" for card, result in by_card))
 
-        except Exception as e:
-            logging.error(f"Error in on_calculator_change: {e}")
+    def clear_range_selector(self):
+        self.range_selector.blockSignals(True)
+        self.range_selector.setCurrentIndex(0)
+        self.range_selector.blockSignals(False)
+        GLOBAL_STATE["villain_range"] = ""
 
     def get_community_cards_js(self):
         return """
@@ -901,37 +887,23 @@ class FoundryOverlay(QMainWindow):
         if not players:
             return "none"
 
-        players.sort(key=lambda p: p.get("seatIndex", -1))
-
         hero = next((p for p in players if p.get("isHero")), None)
         dealer = next((p for p in players if p.get("isDealer")), None)
 
         if not hero or not dealer:
             return "none"
 
-        dealer_idx = players.index(dealer)
-        rotated_players = players[dealer_idx:] + players[:dealer_idx]
-        total = len(rotated_players)
+        # Seat names come from the shared table, which the bet sizer also uses for in-position checks
+        seats = tuple(sorted(p.get("seatIndex", -1) for p in players))
+        layout = table_layout(seats, dealer.get("seatIndex", -1))
+        GLOBAL_STATE["table_layout"] = layout
+        for p in players:
+            p["position"] = layout.positions[p.get("seatIndex", -1)]
 
-        if total == 2:
-            positions = ["SB", "BB"]
-            for i, player in enumerate(rotated_players):
-                player["position"] = positions[i]
-        else:
-            for p in players:
-                p["position"] = "Unknown"
-            dealer["position"] = "BTN"
-
-            non_dealers = [p for p in rotated_players if p != dealer]
-            reversed_priority = ["UTG-1", "UTG", "UTG+1", "UTG+2", "LJ", "HJ", "CO"]
-            needed_positions = ["SB", "BB"] + reversed_priority[-(len(non_dealers) - 2):]
-            for i, p in enumerate(non_dealers):
-                if i < len(needed_positions):
-                    p["position"] = needed_positions[i]
-
-        hero_position = next((p["position"] for p in players if p.get("isHero")), "Unknown")
+        hero_position = hero["position"]
         # ✅ Update GLOBAL_STATE
         GLOBAL_STATE["hero_position"] = hero_position.lower()
+        self.bet_sizer.update(hero_position=GLOBAL_STATE["hero_position"], table_layout=layout)
 
         return hero_position.lower()
 
@@ -953,15 +925,11 @@ class FoundryOverlay(QMainWindow):
                     logging.info(f"{name} revealed: {cards_str}")
                     self.last_revealed_hands[name] = cards_str
 
-                    # ✅ Normalize to all caps and convert 10 to T
-                    def normalize(card):
-                        rank, suit = card[:-1], card[-1]
-                        rank = 'T' if rank == '10' else rank.upper()
-                        suit = suit.upper()
-                        return rank + suit
+                    cards = parse_cards(cards_list)
+                    if cards is None:
+                        raise ValueError(f"Invalid revealed cards: {cards_str}")
 
-                    normalized = [normalize(card) for card in cards_list]
-                    condensed = "".join(normalized)  # e.g., AHTD
+                    condensed = condense(cards)  # e.g., AHTD
                     GLOBAL_STATE["calculator_input"] = condensed
                     self.calculator_input.setText(condensed)
                     self.on_calculator_change()
@@ -971,17 +939,15 @@ class FoundryOverlay(QMainWindow):
 
     def handle_community_cards(self, cards):
         try:
-            def normalize(card):
-                rank, suit = card[:-1], card[-1]
-                rank = 'T' if rank == '10' else rank.upper()
-                suit = suit.upper()
-                return rank + suit
-
-            normalized = [normalize(card) for card in cards]
-            condensed = "".join(normalized)
+            board = parse_cards(cards)
+            if board is None:
+                raise ValueError(f"Invalid community cards: {cards}")
 
+            condensed = condense(board)
             if GLOBAL_STATE.get("community_cards") != condensed:
                 GLOBAL_STATE["community_cards"] = condensed
+                GLOBAL_STATE["board_cards"] = tuple(board)
+                self.bet_sizer.update(board=GLOBAL_STATE["board_cards"])
                 self.on_calculator_change()  # ✅ Trigger update
         except Exception as e:
             logging.error(f"Error processing community cards: {e}")
@@ -999,28 +965,11 @@ class FoundryOverlay(QMainWindow):
             self.previous_hand = hand_str
 
         try:
-            def normalize(card):
-                rank, suit = card[:-1], card[-1]
-                rank = 'T' if rank == '10' else rank.upper()
-                return rank, suit
-
-            rank1, suit1 = normalize(card1)
-            rank2, suit2 = normalize(card2)
+            cards = parse_cards(hand)
+            if cards is None:
+                raise ValueError(f"Invalid hero cards: {hand_str}")
 
-            valid_ranks = '23456789TJQKA'
-            if rank1 not in valid_ranks or rank2 not in valid_ranks:
-                raise ValueError(f"Invalid rank: {rank1} or {rank2}")
-
-            def rank_value(r):
-                return valid_ranks.index(r)
-
-            # Normalize rank order
-            if rank_value(rank1) < rank_value(rank2):
-                rank1, rank2 = rank2, rank1
-                suit1, suit2 = suit2, suit1
-
-            suited = suit1 == suit2
-            condensed_hand = f"{rank1}{rank2}{'s' if suited else 'o'}"
+            condensed_hand = hand_class(*cards)
 
             special_on = GLOBAL_STATE["special_hand_enabled"]
             suited_only = GLOBAL_STATE["suited_only"]
@@ -1028,19 +977,21 @@ class FoundryOverlay(QMainWindow):
             pos = self.process_players(players)
             if pos == "utg-1":
                 pos = "utg"
+            villain_pos, raises = self.preflop_facing(players)
 
             # Prepare arguments
-            args = (condensed_hand, pos, special_on, special_hand, suited_only)
+            args = (condensed_hand, pos, special_on, special_hand, suited_only, villain_pos, raises)
 
             # Check if inputs changed
             if args != self.last_suggestion_args:
-                result = should_play_hand(*args)
+                result = should_play_hand(*args[:5], villain_position=villain_pos, raises=raises)
                 suggestion = result.upper()
                 GLOBAL_STATE["suggestion"] = suggestion
-                GLOBAL_STATE["hero_hand"] = [card1.upper(), card2.upper()]
+                GLOBAL_STATE["hero_hand"] = tuple(cards)
                 self.on_calculator_change()
                 self.update_dynamic_labels()
-                print(f"{condensed_hand} in {pos.upper()} → {suggestion}")
+                facing = f" vs {villain_pos.upper()} ({raises} raise{'s' if raises > 1 else ''})" if raises else ""
+                print(f"{condensed_hand} in {pos.upper()}{facing} → {suggestion}")
                 self.last_suggestion_args = args
 
 
@@ -1048,6 +999,45 @@ class FoundryOverlay(QMainWindow):
             print(f"Error processing hand: {e}")
             GLOBAL_STATE["suggestion"] = "ERROR"
 
+    def preflop_facing(self, players):
+        """
+        Returns (villain position, raises Hero is facing) before the flop, or (None, 0) when
+        nobody has raised past Hero. Raise depth comes from the betting sequence: it goes up each
+        poll the top bet rises above the big blind, so a 3-bet still counts as two raises after
+        the opener folds. The villain is whoever holds the biggest bet.
+
+        :param players: Players with positions assigned by process_players.
+        """
+        if GLOBAL_STATE.get("board_cards"):
+            return None, 0
+
+        big_blind = GLOBAL_STATE.get("big_blind", 0.0)
+        active_players = GLOBAL_STATE.get("active_players", [])
+
+        # A new hand starts a new sequence, like BetSizerState does on a button move
+        sequence = self.preflop_sequence
+        hand_key = (GLOBAL_STATE.get("button_seat"), self.previous_hand)
+        if sequence["hand"] != hand_key:
+            sequence.update(hand=hand_key, top_bet=0.0, raises=0)
+        top_bet = max((p.get("last_bet", 0) for p in active_players), default=0)
+        if top_bet > max(big_blind, sequence["top_bet"]):
+            sequence["raises"] += 1
+            sequence["top_bet"] = top_bet
+
+        hero_bet = next((p.get("last_bet", 0) for p in active_players if p.get("is_hero")), 0)
+        aggressor = max((p for p in active_players if not p.get("is_hero")),
+                        key=lambda p: p.get("last_bet", 0), default=None)
+        if aggressor is None or aggressor.get("last_bet", 0) <= max(big_blind, hero_bet):
+            return None, 0
+
+        # Raises made between two polls only show up as the distinct bets still on the table
+        villain_bet = aggressor["last_bet"]
+        visible = len({p.get("last_bet", 0) for p in active_players if big_blind < p.get("last_bet", 0) <= villain_bet})
+        raises = max(sequence["raises"], visible)
+        villain_pos = next((p.get("position", "") for p in players if p.get("seatIndex") == aggressor.get("seat")), "")
+        villain_pos = villain_pos.lower()
+        return ("utg" if villain_pos == "utg-1" else villain_pos), raises
+
     def update_dynamic_labels(self):
         key_mapping = {
             "win_%": "win_percent",
@@ -1061,6 +1051,10 @@ class FoundryOverlay(QMainWindow):
             elif real_key.upper() in GLOBAL_STATE.get("stats", {}):
                 label.setText(str(GLOBAL_STATE["stats"][real_key.upper()]))
 
+    def closeEvent(self, event):
+        self.equity_worker.shutdown()
+        super().closeEvent(event)
+
     def toggle_special_hand_options(self, state):
         checked = state == Qt.CheckState.Checked.value
         self.special_hand_input.setVisible(checked)
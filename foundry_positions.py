@@ -0,0 +1,53 @@
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Tuple
+
+MAX_SEATS = 10
+
+# Seats between the blinds and the button, in the order they are named from the button backwards
+MIDDLE_POSITIONS = ("UTG-1", "UTG", "UTG+1", "UTG+2", "LJ", "HJ", "CO")
+
+
+def _names_from_button(players: int) -> Tuple[str, ...]:
+    """Position names for a table of `players`, starting with the dealer seat."""
+    if players == 2:
+        return ("SB", "BB")  # heads-up the dealer posts the small blind
+    middle = MIDDLE_POSITIONS[-(players - 3):] if players > 3 else ()
+    return ("BTN", "SB", "BB")[:players] + middle
+
+
+# Table size -> position names clockwise from the dealer
+POSITION_NAMES = {players: _names_from_button(players) for players in range(1, MAX_SEATS + 1)}
+
+# The bet sizer's position numbering, 1 = SB ... 10 = BTN
+BET_SIZER_POSITION_INDEX = {
+    name: i + 1 for i, name in enumerate(["sb", "bb", "utg-1", "utg", "utg+1", "utg+2", "lj", "hj", "co", "btn"])
+}
+
+
+class TableLayout(NamedTuple):
+    """Where everyone sits relative to the dealer for one hand."""
+    positions: Mapping[int, str]  # seat -> position name, e.g. 'CO'
+    postflop_order: Mapping[int, int]  # seat -> 0 for the first to act after the flop, the dealer acts last
+
+    def in_position(self, hero_seat: int, villain_seat: int) -> bool:
+        """True if Hero acts after the villain on every postflop street."""
+        return self.postflop_order[hero_seat] > self.postflop_order[villain_seat]
+
+
+@lru_cache(maxsize=1024)
+def table_layout(seats: Tuple[int, ...], dealer_seat: int) -> TableLayout:
+    """
+    Names every occupied seat for a dealer seat. Cached per (seats, dealer) so each poll is
+    a dictionary lookup; the open-fold suggester and the bet sizer read the same layout.
+
+    :param seats: Sorted tuple of occupied seat numbers.
+    :param dealer_seat: The seat with the dealer button; must be one of `seats`.
+    """
+    start = seats.index(dealer_seat)
+    rotated = seats[start:] + seats[:start]
+    names = POSITION_NAMES.get(len(rotated), ())
+
+    positions = {seat: names[i] if i < len(names) else "Unknown" for i, seat in enumerate(rotated)}
+    postflop_order = {seat: (i - 1) % len(rotated) for i, seat in enumerate(rotated)}
+    return TableLayout(MappingProxyType(positions), MappingProxyType(postflop_order))
@@ -0,0 +1,359 @@
+import zlib
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+from foundry_board_texture import STRAIGHT_WINDOWS
+from foundry_cards import RANKS, card_to_int, popcount
+from foundry_evaluator import HAND_CATEGORIES, evaluate_batch, hand_category
+from foundry_open_fold import POKER_RANK_ORDER, RANGE_STORE
+
+# Runouts sampled per board when there are too many to enumerate
+DEFAULT_RUNOUT_SAMPLES = 500  # about ±1.5% standard error on a preflop range equity
+EXACT_RUNOUT_LIMIT = 1176  # flop (49 choose 2 turn-river pairs) and turn boards are enumerated, preflop is sampled
+RANGE_VS_RANGE_RUNOUT_LIMIT = 50  # range vs range enumerates turns only; flops are sampled to fit the overlay poll
+SCORE_CHUNK_RUNOUTS = 128  # runouts scored per evaluate_batch call, bounds peak memory on wide ranges
+
+
+def expand_hand_class(hand_class):
+    """
+    Expands a chart key like 'KAs', 'QKo' or 'AA' into its card-integer combos.
+    """
+    r1, r2 = RANKS.index(hand_class[0]), RANKS.index(hand_class[1])
+    if r1 == r2:
+        return [(r1 * 4 + s1, r1 * 4 + s2) for s1, s2 in combinations(range(4), 2)]
+    if hand_class[2] == "s":
+        return [(r1 * 4 + s, r2 * 4 + s) for s in range(4)]
+    return [(r1 * 4 + s1, r2 * 4 + s2) for s1 in range(4) for s2 in range(4) if s1 != s2]
+
+
+def _cell_hand_class(row, col):
+    """Returns the hand class of a chart grid cell, see foundry_open_fold.hand_cell for the layout."""
+    high, low = POKER_RANK_ORDER[min(row, col)], POKER_RANK_ORDER[max(row, col)]
+    if row == col:
+        return high + low
+    return high + low + ("s" if row < col else "o")
+
+
+# Combos of each of the 169 chart cells, flattened row by row like RangeStore.cell_frequencies
+CELL_COMBOS = [expand_hand_class(_cell_hand_class(row, col)) for row in range(13) for col in range(13)]
+
+_loaded_ranges = {}  # position -> (chart mtime, strategy dict, (combos, weights))
+
+
+def load_range(position):
+    """
+    Builds a position's chart into combo and weight arrays. Each combo is weighted by how often
+    its cell raises: an action letter's frequency from ranges/strategy.json, or the 'raise'
+    share of a mixed cell like {"raise": 0.5}.
+
+    The chart and strategy come from RANGE_STORE, and the arrays are rebuilt whenever
+    either one is reloaded after an edit.
+
+    :param position: Position name with a chart in ranges/, e.g. 'co'.
+    :return: (combos int8 array of shape (N, 2), weights float array of shape (N,)).
+    """
+    mtime = RANGE_STORE.chart(position)[0]
+    strategy = RANGE_STORE.strategy()
+    loaded = _loaded_ranges.get(position)
+    if loaded is not None and loaded[0] == mtime and loaded[1] is strategy:
+        return loaded[2]
+
+    combos, weights = [], []
+    for cell_combos, (raise_freq, _) in zip(CELL_COMBOS, RANGE_STORE.cell_frequencies(position)):
+        if raise_freq > 0:
+            combos.extend(cell_combos)
+            weights.extend([raise_freq] * len(cell_combos))
+    result = (np.array(combos, dtype=np.int8).reshape(-1, 2), np.array(weights, dtype=float))
+    _loaded_ranges[position] = (mtime, strategy, result)
+    return result
+
+
+def _runouts(board, count, samples, limit=EXACT_RUNOUT_LIMIT):
+    """
+    Returns every runout of `count` cards when that is cheap enough, otherwise a seeded sample.
+
+    The sample is seeded from the board so repeated calls on the same board agree.
+    """
+    deck = np.array([c for c in range(52) if c not in board], dtype=np.int8)
+    if count == 0:
+        return np.zeros((1, 0), dtype=np.int8)
+
+    all_runouts = list(combinations(range(len(deck)), count)) if count <= 2 else None
+    if all_runouts is not None and len(all_runouts) <= limit:
+        return deck[np.array(all_runouts)]
+
+    rng = np.random.default_rng(zlib.crc32(bytes(board)))
+    picks = np.argsort(rng.random((samples, len(deck))), axis=1)[:, :count]
+    return deck[picks]
+
+
+@lru_cache(maxsize=32)
+def _board_scores(board, combos_key, samples, limit=EXACT_RUNOUT_LIMIT):
+    """
+    Scores every combo in a range on every runout of a board. Cached per board and range,
+    so Hero-only changes on the same board reuse it.
+
+    :return: (runouts array (R, k), scores array (R, N), blocked mask (R, N)).
+    """
+    combos = np.frombuffer(combos_key, dtype=np.int8).reshape(-1, 2)
+    runouts = _runouts(board, 5 - len(board), samples, limit)
+    full_boards = np.concatenate(
+        [np.broadcast_to(np.array(board, dtype=np.int8), (len(runouts), len(board))), runouts], axis=1
+    )
+
+    # Every (runout, combo) pair as one row of 7 cards, a chunk of runouts at a time
+    n_combos = len(combos)
+    scores = np.empty((len(full_boards), n_combos), dtype=np.int32)
+    for start in range(0, len(full_boards), SCORE_CHUNK_RUNOUTS):
+        chunk = full_boards[start:start + SCORE_CHUNK_RUNOUTS]
+        hands = np.concatenate([
+            np.repeat(chunk, n_combos, axis=0),
+            np.tile(combos, (len(chunk), 1)),
+        ], axis=1)
+        scores[start:start + len(chunk)] = evaluate_batch(hands).reshape(len(chunk), n_combos)
+
+    blocked = (combos[None, :, :, None] == runouts[:, None, None, :]).any(axis=(2, 3))
+    return runouts, scores, blocked
+
+
+def _hero_vs_combos(hero, board, villain_combos, villain_weights, samples):
+    """
+    Scores Hero and every villain combo on the board's runouts.
+
+    :return: (live villain combos, weights with Hero's blockers zeroed, runouts Hero can see,
+              Hero scores (R, 1), villain scores (R, N), blocked mask (R, N)).
+    """
+    # Only board removal goes into the cached per-board scores; Hero removal is applied as weights
+    on_board = np.isin(villain_combos, board).any(axis=1)
+    combos = np.ascontiguousarray(villain_combos[~on_board])
+    weights = np.where(np.isin(combos, hero).any(axis=1), 0.0, np.asarray(villain_weights)[~on_board])
+    if not weights.any():
+        raise ValueError("Every combo in the villain range is blocked by Hero's cards or the board.")
+
+    runouts, villain_scores, blocked = _board_scores(board, combos.tobytes(), samples)
+
+    hero_runouts = ~np.isin(runouts, hero).any(axis=1)
+    runouts = runouts[hero_runouts]
+    full_boards = np.concatenate(
+        [np.broadcast_to(np.array(board, dtype=np.int8), (len(runouts), len(board))), runouts], axis=1
+    )
+    hero_scores = evaluate_batch(
+        np.concatenate([full_boards, np.broadcast_to(np.array(hero, dtype=np.int8), (len(runouts), 2))], axis=1)
+    )
+    return combos, weights, runouts, hero_scores[:, None], villain_scores[hero_runouts], blocked[hero_runouts]
+
+
+def hand_vs_range_equity(hero_strs, villain_combos, villain_weights, board_strs=[], samples=DEFAULT_RUNOUT_SAMPLES):
+    """
+    Computes Hero's weighted win, tie and loss against a villain range, with card removal.
+
+    :param hero_strs: Hero's two cards, as strings like ['AC', '7C'] or card integers.
+    :param villain_combos: int8 array of villain combos, e.g. from load_range.
+    :param villain_weights: Weight for each villain combo.
+    :param board_strs: 0 to 5 community cards, as strings or card integers.
+    :param samples: Runouts to sample when there are too many to enumerate.
+    :return: Dict with 'win', 'tie' and 'loss' decimals.
+    """
+    hero = [card_to_int(s) for s in hero_strs]
+    board = tuple(card_to_int(s) for s in board_strs)
+
+    _, weights, _, hero_scores, villain_scores, blocked = _hero_vs_combos(
+        hero, board, villain_combos, villain_weights, samples
+    )
+    pair_weights = np.where(blocked, 0.0, weights)
+
+    total = pair_weights.sum()
+    win = (pair_weights * (hero_scores > villain_scores)).sum() / total
+    tie = (pair_weights * (hero_scores == villain_scores)).sum() / total
+    return {"win": float(win), "tie": float(tie), "loss": float(max(0.0, 1.0 - win - tie))}
+
+
+HAND_STRENGTH_BUCKETS = ("made", "draw", "air")
+
+def classify_hand_strength(combos, board):
+    """
+    Buckets each combo on a flop, turn or river board as a made hand, a draw or air.
+
+    Made hands pair the board with a hole card, hold a pocket pair, or make a straight
+    or better. Draws are everything else with four to a flush or four ranks of a straight
+    that use a hole card, and only exist before the river.
+
+    :param combos: int8 array of combos, shape (N, 2).
+    :param board: 3 to 5 card integers.
+    :return: int8 array of indexes into HAND_STRENGTH_BUCKETS.
+    """
+    combos = np.asarray(combos, dtype=np.int64)
+    board = np.asarray(board, dtype=np.int64)
+
+    hole_ranks = combos >> 2
+    board_rank_mask = np.bitwise_or.reduce(1 << (board >> 2)) if len(board) else 0
+    hole_rank_mask = (1 << hole_ranks[:, 0]) | (1 << hole_ranks[:, 1])
+    all_rank_mask = hole_rank_mask | board_rank_mask
+
+    scores = evaluate_batch(np.concatenate([combos, np.broadcast_to(board, (len(combos), len(board)))], axis=1))
+    made = (
+        (hole_ranks[:, 0] == hole_ranks[:, 1])
+        | ((hole_rank_mask & board_rank_mask) != 0)
+        | (hand_category(scores) >= HAND_CATEGORIES.index("Straight"))
+    )
+
+    draw = np.zeros(len(combos), dtype=bool)
+    if len(board) < 5:
+        board_suits = np.bincount(board & 3, minlength=4)
+        for suit in range(4):
+            hole_suited = ((combos & 3) == suit).sum(axis=1)
+            draw |= (hole_suited > 0) & (hole_suited + board_suits[suit] == 4)
+        for window in STRAIGHT_WINDOWS:
+            draw |= (popcount(all_rank_mask & window) == 4) & (popcount(board_rank_mask & window) < 4)
+
+    return np.where(made, 0, np.where(draw, 1, 2)).astype(np.int8)
+
+
+def equity_distribution(hero_strs, villain_combos, villain_weights, board_strs=[], bins=10,
+                        samples=DEFAULT_RUNOUT_SAMPLES):
+    """
+    Computes Hero's equity against each combo of a villain range in one batch, and summarises it
+    as a histogram and by the villain's hand strength.
+
+    :param hero_strs: Hero's two cards, as strings like ['AC', '7C'] or card integers.
+    :param villain_combos: int8 array of villain combos, e.g. from load_range.
+    :param villain_weights: Weight for each villain combo.
+    :param board_strs: 0 to 5 community cards, as strings or card integers.
+    :param bins: Number of equal-width equity bins between 0 and 1.
+    :param samples: Runouts to sample when there are too many to enumerate.
+    :return: Dict with 'equity' (Hero's overall equity, ties counted as half), 'histogram'
+             (share of the range's weight in each bin, lowest equity first), 'bin_edges', and
+             'buckets' mapping 'made'/'draw'/'air' to the villain range's 'share' of each and
+             Hero's 'equity' against it. Buckets are empty preflop.
+    """
+    hero = [card_to_int(s) for s in hero_strs]
+    board = tuple(card_to_int(s) for s in board_strs)
+
+    combos, weights, _, hero_scores, villain_scores, blocked = _hero_vs_combos(
+        hero, board, villain_combos, villain_weights, samples
+    )
+
+    # Hero's equity against each villain combo over the runouts it can see
+    points = np.where(blocked, 0.0, (hero_scores > villain_scores) + 0.5 * (hero_scores == villain_scores))
+    seen = np.maximum((~blocked).sum(axis=0), 1)
+    combo_equity = points.sum(axis=0) / seen
+
+    total = weights.sum()
+    histogram, edges = np.histogram(combo_equity, bins=bins, range=(0.0, 1.0), weights=weights)
+    result = {
+        "equity": float((combo_equity * weights).sum() / total),
+        "histogram": [float(share) for share in histogram / total],
+        "bin_edges": [float(edge) for edge in edges],
+        "buckets": {},
+    }
+
+    if len(board) >= 3:
+        strength = classify_hand_strength(combos, board)
+        for index, name in enumerate(HAND_STRENGTH_BUCKETS):
+            bucket_weights = np.where(strength == index, weights, 0.0)
+            share = bucket_weights.sum()
+            result["buckets"][name] = {
+                "share": float(share / total),
+                "equity": float((combo_equity * bucket_weights).sum() / share) if share else None,
+            }
+    return result
+
+
+def _weight_below(hero_scores, villain_scores, villain_weights):
+    """
+    For every runout row, the villain weight scoring below and level with each Hero score.
+
+    Each row's villain scores are sorted and offset by the row number, so a single searchsorted
+    over all rows reads the beaten and tied weight off one running weight total.
+
+    :param hero_scores: (R, Nh) scores.
+    :param villain_scores: (R, Nv) scores.
+    :param villain_weights: (R, Nv) weights.
+    :return: (beaten, tied, total) weight arrays; beaten and tied have shape (R, Nh), total (R, 1).
+    """
+    n_rows, n_villain = villain_scores.shape
+    offsets = np.arange(n_rows, dtype=np.int64)[:, None] << 32
+    order = np.argsort(villain_scores, axis=1)
+    sorted_scores = (np.take_along_axis(villain_scores, order, axis=1) + offsets).ravel()
+    running = np.concatenate([[0.0], np.cumsum(np.take_along_axis(villain_weights, order, axis=1))])
+
+    keys = hero_scores + offsets
+    below = running[np.searchsorted(sorted_scores, keys, side="left")]
+    through = running[np.searchsorted(sorted_scores, keys, side="right")]
+    row_start = running[np.arange(n_rows)[:, None] * n_villain]
+    row_total = running[(np.arange(n_rows)[:, None] + 1) * n_villain] - row_start
+    return below - row_start, through - below, row_total
+
+
+def range_vs_range_equity(hero_combos, hero_weights, villain_combos, villain_weights, board_strs=[],
+                          samples=DEFAULT_RUNOUT_SAMPLES, runout_limit=RANGE_VS_RANGE_RUNOUT_LIMIT):
+    """
+    Computes the weighted win, tie and loss of one range against another on a board.
+
+    Both ranges are scored together on the same runouts, and combo pairs that share a
+    card with each other or with the runout are left out. Every runout is handled at once:
+    Hero combos are matched against sorted villain scores, then the pairs that share a card
+    are taken back out card by card.
+
+    :param hero_combos: int8 array of Hero combos.
+    :param hero_weights: Weight for each Hero combo.
+    :param villain_combos: int8 array of villain combos.
+    :param villain_weights: Weight for each villain combo.
+    :param board_strs: 0 to 5 community cards, as strings or card integers.
+    :param samples: Runouts to sample when there are too many to enumerate.
+    :param runout_limit: Most runouts to enumerate before sampling; EXACT_RUNOUT_LIMIT makes flops exact.
+    :return: Dict with 'win', 'tie' and 'loss' decimals.
+    """
+    board = tuple(card_to_int(s) for s in board_strs)
+
+    hero_live = ~np.isin(hero_combos, board).any(axis=1)
+    villain_live = ~np.isin(villain_combos, board).any(axis=1)
+    hero_combos, hero_weights = hero_combos[hero_live], np.asarray(hero_weights)[hero_live]
+    villain_combos, villain_weights = villain_combos[villain_live], np.asarray(villain_weights)[villain_live]
+
+    combos = np.ascontiguousarray(np.concatenate([hero_combos, villain_combos]))
+    _, scores, blocked = _board_scores(board, combos.tobytes(), samples, runout_limit)
+    n_hero = len(hero_combos)
+    hero_scores, villain_scores = scores[:, :n_hero], scores[:, n_hero:]
+    hero_live = np.where(blocked[:, :n_hero], 0.0, hero_weights)  # (R, Nh) weights after runout removal
+    villain_live = np.where(blocked[:, n_hero:], 0.0, villain_weights)  # (R, Nv)
+
+    beaten, tied, faced = _weight_below(hero_scores, villain_scores, villain_live)
+    wins, ties, total = (hero_live * beaten).sum(), (hero_live * tied).sum(), (hero_live * faced).sum()
+
+    # Combo pairs that share a card can never happen. Take out the pairs that both hold each card,
+    # then add back identical combos, which hold two shared cards and were taken out twice.
+    for card in range(52):
+        hero_holding = (hero_combos == card).any(axis=1)
+        villain_holding = (villain_combos == card).any(axis=1)
+        if not (hero_holding.any() and villain_holding.any()):
+            continue
+        holding_live = hero_live[:, hero_holding]
+        below, equal, weight = _weight_below(hero_scores[:, hero_holding], villain_scores[:, villain_holding],
+                                             villain_live[:, villain_holding])
+        wins -= (holding_live * below).sum()
+        ties -= (holding_live * equal).sum()
+        total -= (holding_live * weight).sum()
+
+    hero_keys = np.sort(hero_combos.astype(np.int64), axis=1) @ [52, 1]
+    villain_keys = np.sort(villain_combos.astype(np.int64), axis=1) @ [52, 1]
+    _, same_hero, same_villain = np.intersect1d(hero_keys, villain_keys, return_indices=True)
+    same_weights = (hero_live[:, same_hero] * villain_live[:, same_villain]).sum()
+    ties += same_weights
+    total += same_weights
+
+    win, tie = wins / total, ties / total
+    return {"win": float(win), "tie": float(tie), "loss": float(max(0.0, 1.0 - win - tie))}
+
+
+# Example usage
+if __name__ == "__main__":
+    co_combos, co_weights = load_range("co")
+    print(hand_vs_range_equity(["AC", "7C"], co_combos, co_weights, ["QC", "5H", "2C"]))
+
+    btn_combos, btn_weights = load_range("btn")
+    print(range_vs_range_equity(btn_combos, btn_weights, co_combos, co_weights, ["QC", "5H", "2C"]))
+
+    print(equity_distribution(["AC", "7C"], co_combos, co_weights, ["QC", "5H", "2C"]))
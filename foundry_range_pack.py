@@ -0,0 +1,160 @@
+import os
+import json
+import struct
+import argparse
+import logging
+
+import numpy as np
+
+from foundry_open_fold import RANGES_DIR, VALID_POSITIONS, MIXED_ACTION, DEFAULT_STRATEGY, FACING_DIR, RangeStore, \
+    hand_cell, parse_chart_value
+
+PACKED_RANGES_PATH = os.path.join(RANGES_DIR, "ranges.bin")
+PACK_MAGIC = b"FRNG"
+PACK_VERSION = 1
+HEADER = struct.Struct("<4sHH")  # magic, format version, number of positions
+NAME_SIZE = 8  # position names are stored as null-padded ASCII
+FREQUENCY_SCALE = 255  # frequencies are stored as uint8 fractions of this
+
+# Each of the 169 cells holds [action letter, raise frequency, call frequency]; fold is the rest
+CELL_FIELDS = 3
+
+
+def validate_chart(data, strategy=DEFAULT_STRATEGY, complete=True):
+    """
+    Checks a parsed JSON chart. Returns a list of problems; an empty list means it is valid.
+
+    :param complete: Require all 169 hands. Facing charts may leave out the hands they fold.
+    """
+    problems = []
+    seen = {}
+    for hand, value in data.items():
+        try:
+            cell = hand_cell(hand)
+        except (ValueError, IndexError):
+            problems.append(f"'{hand}' is not a starting hand")
+            continue
+        if cell in seen:
+            problems.append(f"'{hand}' duplicates '{seen[cell]}'")
+        seen[cell] = hand
+
+        try:
+            parse_chart_value(value, strategy)
+        except ValueError as e:
+            problems.append(f"'{hand}': {e}")
+
+    missing = 169 - len(seen)
+    if missing and complete:
+        problems.append(f"{missing} of the 169 starting hands are missing")
+    return problems
+
+
+def pack_ranges(ranges_dir=RANGES_DIR, path=PACKED_RANGES_PATH):
+    """
+    Validates every position's JSON chart and writes them all into one packed file.
+
+    Letter cells also record the frequencies ranges/strategy.json gave them at packing time,
+    but the range store always takes those from the current strategy file.
+
+    :raises ValueError: If any chart is invalid; nothing is written in that case.
+    """
+    strategy = RangeStore(ranges_dir).strategy()
+    positions = sorted(p for p in VALID_POSITIONS if os.path.exists(os.path.join(ranges_dir, f"{p}.json")))
+    cells = np.zeros((len(positions), 169, CELL_FIELDS), dtype=np.uint8)
+
+    problems = []
+    for i, position in enumerate(positions):
+        with open(os.path.join(ranges_dir, f"{position}.json"), "r") as file:
+            data = json.load(file)
+
+        chart_problems = validate_chart(data, strategy)
+        problems += [f"{position}: {problem}" for problem in chart_problems]
+        if chart_problems:
+            continue
+
+        for hand, value in data.items():
+            row, col = hand_cell(hand)
+            action, raise_freq, call_freq = parse_chart_value(value, strategy)
+            cells[i, row * 13 + col] = (ord(action), round(raise_freq * FREQUENCY_SCALE),
+                                        round(call_freq * FREQUENCY_SCALE))
+
+    if problems:
+        raise ValueError("Invalid range charts:\n" + "\n".join(problems))
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(positions)))
+        for position in positions:
+            f.write(position.encode("ascii").ljust(NAME_SIZE, b"\0"))
+        f.write(cells.tobytes())
+    logging.info(f"Packed {len(positions)} range charts into '{path}' ({os.path.getsize(path)} bytes)")
+
+
+class PackedRanges:
+    """
+    Memory-mapped view over a file written by pack_ranges.
+    """
+
+    def __init__(self, path=PACKED_RANGES_PATH):
+        with open(path, "rb") as f:
+            magic, version, count = HEADER.unpack(f.read(HEADER.size))
+            names = f.read(count * NAME_SIZE)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"'{path}' is not a version {PACK_VERSION} packed range file.")
+
+        self.positions = {
+            names[i * NAME_SIZE:(i + 1) * NAME_SIZE].rstrip(b"\0").decode("ascii"): i for i in range(count)
+        }
+        self.cells = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.size + count * NAME_SIZE,
+                               shape=(count, 169, CELL_FIELDS))
+
+    def grid(self, position):
+        """
+        Returns a position's chart as a 13x13 grid of action letters, like RangeStore keeps.
+        """
+        letters = self.cells[self.positions[position], :, 0]
+        return [[chr(letters[row * 13 + col]) for col in range(13)] for row in range(13)]
+
+    def frequencies(self, hand, position):
+        """
+        Returns (raise, call) frequencies for a hand; the fold frequency is what remains.
+        """
+        row, col = hand_cell(hand)
+        cell = self.cells[self.positions[position], row * 13 + col]
+        return int(cell[1]) / FREQUENCY_SCALE, int(cell[2]) / FREQUENCY_SCALE
+
+    def mixed_cells(self, position):
+        """
+        Returns {(row, col): (raise, call)} for the cells of a position given as explicit frequencies.
+        """
+        cells = self.cells[self.positions[position]]
+        return {
+            divmod(i, 13): (int(cells[i, 1]) / FREQUENCY_SCALE, int(cells[i, 2]) / FREQUENCY_SCALE)
+            for i in np.flatnonzero(cells[:, 0] == ord(MIXED_ACTION))
+        }
+
+
+# Convert and validate the JSON charts
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack the JSON range charts into one binary file.")
+    parser.add_argument("--ranges-dir", default=RANGES_DIR)
+    parser.add_argument("--out", default=PACKED_RANGES_PATH)
+    parser.add_argument("--validate", action="store_true", help="only check the JSON charts")
+    cli_args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if cli_args.validate:
+        strategy_in_use = RangeStore(cli_args.ranges_dir).strategy()
+        facing_dir = os.path.join(cli_args.ranges_dir, FACING_DIR)
+        facing_names = sorted(os.listdir(facing_dir)) if os.path.isdir(facing_dir) else []
+        charts_to_check = [(name, f"{name}.json", True) for name in sorted(VALID_POSITIONS)]
+        charts_to_check += [(name[:-len(".json")], os.path.join(FACING_DIR, name), False)
+                            for name in facing_names if name.endswith(".json")]
+
+        for name, relative_path, complete in charts_to_check:
+            chart_path = os.path.join(cli_args.ranges_dir, relative_path)
+            if os.path.exists(chart_path):
+                with open(chart_path, "r") as chart_file:
+                    found = validate_chart(json.load(chart_file), strategy_in_use, complete)
+                print(f"{name}: " + ("ok" if not found else "; ".join(found)))
+    else:
+        pack_ranges(cli_args.ranges_dir, cli_args.out)
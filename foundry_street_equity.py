@@ -0,0 +1,196 @@
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+from foundry_cards import CARD_STRS, card_to_int
+from foundry_evaluator import HAND_CATEGORIES, evaluate_batch, hand_category
+
+FLOP_CACHE_SIZE = 64  # flop enumerations kept, a few kilobytes each
+
+
+def _score_both(hero, villain, boards):
+    """
+    Scores Hero's and Villain's hands on each board row.
+
+    :return: (Hero scores, Villain scores).
+    """
+    n = len(boards)
+    scores = evaluate_batch(np.concatenate([
+        np.concatenate([np.broadcast_to(np.array(hero, dtype=np.int8), (n, 2)), boards], axis=1),
+        np.concatenate([np.broadcast_to(np.array(villain, dtype=np.int8), (n, 2)), boards], axis=1),
+    ]))
+    return scores[:n], scores[n:]
+
+
+class FlopEnumeration:
+    """
+    Every turn and river runout of one hero/villain/flop matchup, scored once on the flop.
+
+    Turn and river equity are read off the stored runouts by keeping the ones that
+    contain the cards dealt since, so a street change costs no hand evaluations.
+    """
+
+    def __init__(self, hero, villain, flop):
+        dead = set(hero) | set(villain) | set(flop)
+        if len(dead) != 7:
+            raise ValueError(f"Duplicate cards in hands or flop: {hero} {villain} {flop}")
+
+        self.deck = np.array([c for c in range(52) if c not in dead], dtype=np.int8)
+        self.runouts = self.deck[np.array(list(combinations(range(len(self.deck)), 2)))]  # (990, 2)
+
+        flop_rows = np.array(flop, dtype=np.int8)
+        hero_scores, villain_scores = _score_both(hero, villain, np.concatenate(
+            [np.broadcast_to(flop_rows, (len(self.runouts), 3)), self.runouts], axis=1
+        ))
+
+        # 1 = Hero wins, 0 = split, -1 = Villain wins
+        self.outcomes = np.sign(hero_scores - villain_scores).astype(np.int8)
+        self.categories = hand_category(hero_scores).astype(np.int8)
+
+        # Who is ahead right now on the flop, and after each possible turn card (same 1/0/-1 codes)
+        hero_flop, villain_flop = _score_both(hero, villain, flop_rows[None, :])
+        self.flop_leader = int(np.sign(hero_flop[0] - villain_flop[0]))
+        hero_turn, villain_turn = _score_both(hero, villain, np.concatenate(
+            [np.broadcast_to(flop_rows, (len(self.deck), 3)), self.deck[:, None]], axis=1
+        ))
+        self.turn_leaders = np.zeros(52, dtype=np.int8)
+        self.turn_leaders[self.deck] = np.sign(hero_turn - villain_turn)
+
+    def equity(self, later_cards=(), breakdown=False):
+        """
+        Returns Hero's equity once `later_cards` (the turn, or the turn and river) are dealt.
+
+        :param later_cards: Card integers dealt after the flop.
+        :param breakdown: If True, also return how often Hero makes each hand category.
+        :return: Dict with 'win', 'tie' and 'loss' decimals, plus 'categories' when breakdown is set.
+        """
+        live = np.ones(len(self.runouts), dtype=bool)
+        for card in later_cards:
+            live &= (self.runouts == card).any(axis=1)
+
+        outcomes = self.outcomes[live]
+        total = len(outcomes)
+        if total == 0:
+            raise ValueError(f"Turn or river card is already in a hand or on the flop: {list(later_cards)}")
+
+        win = int((outcomes > 0).sum()) / total
+        tie = int((outcomes == 0).sum()) / total
+        result = {"win": win, "tie": tie, "loss": max(0.0, 1.0 - win - tie)}
+
+        if breakdown:
+            counts = np.bincount(self.categories[live], minlength=len(HAND_CATEGORIES))
+            result["categories"] = {
+                HAND_CATEGORIES[i]: int(count) / total for i, count in enumerate(counts) if count
+            }
+        return result
+
+
+    def next_card_breakdown(self, later_cards=()):
+        """
+        Returns Hero's equity after each card that can come next, and the outs: the next
+        cards that change who is ahead. All of it is counted from the stored runouts.
+
+        :param later_cards: Card integers dealt after the flop; at most the turn.
+        :return: Dict with 'leader' (1 Hero ahead, 0 tied, -1 Villain ahead), 'outs' (card
+                 integers that change the leader) and 'cards' (each next card's equity dict).
+        """
+        if len(later_cards) > 1:
+            raise ValueError("No cards are left to come after the river.")
+
+        live = np.ones(len(self.runouts), dtype=bool)
+        for card in later_cards:
+            live &= (self.runouts == card).any(axis=1)
+        if not live.any():
+            raise ValueError(f"Turn card is already in a hand or on the flop: {list(later_cards)}")
+
+        # Each runout counts once for both of its cards
+        seen = self.runouts[live].ravel()
+        outcomes = np.repeat(self.outcomes[live], 2)
+        totals = np.bincount(seen, minlength=52)
+        wins = np.bincount(seen, weights=outcomes > 0, minlength=52)
+        ties = np.bincount(seen, weights=outcomes == 0, minlength=52)
+
+        next_cards = [int(c) for c in self.deck if c not in later_cards]
+        cards = {}
+        for card in next_cards:
+            win, tie = wins[card] / totals[card], ties[card] / totals[card]
+            cards[card] = {"win": float(win), "tie": float(tie), "loss": float(max(0.0, 1.0 - win - tie))}
+
+        if later_cards:
+            # On the turn the river decides the hand, so its outcome is the new leader
+            leader = int(self.turn_leaders[later_cards[0]])
+            next_leaders = {card: int(np.sign(wins[card] - (totals[card] - wins[card] - ties[card])))
+                            for card in next_cards}
+        else:
+            leader = self.flop_leader
+            next_leaders = {card: int(self.turn_leaders[card]) for card in next_cards}
+
+        return {
+            "leader": leader,
+            "outs": [card for card in next_cards if next_leaders[card] != leader],
+            "cards": cards,
+        }
+
+
+@lru_cache(maxsize=FLOP_CACHE_SIZE)
+def _flop_enumeration(hero, villain, flop):
+    return FlopEnumeration(hero, villain, flop)
+
+
+def street_equity(hero_strs, villain_strs, board_strs, breakdown=False):
+    """
+    Computes Hero's exact equity on the flop, turn or river, reusing the flop enumeration
+    of the same hands and flop when the turn and river arrive.
+
+    :param hero_strs: Hero's two cards, as strings like ['AC', '7C'] or card integers.
+    :param villain_strs: Villain's two cards, as strings like ['KC', '10H'] or card integers.
+    :param board_strs: 3 to 5 community cards in the order they were dealt.
+    :param breakdown: If True, also return how often Hero makes each hand category.
+    :return: Dict with 'win', 'tie' and 'loss' decimals, plus 'categories' when breakdown is set.
+    """
+    if not (3 <= len(board_strs) <= 5):
+        raise ValueError("Street equity needs a flop, turn or river board.")
+
+    hero = tuple(sorted(card_to_int(s) for s in hero_strs))
+    villain = tuple(sorted(card_to_int(s) for s in villain_strs))
+    board = [card_to_int(s) for s in board_strs]
+
+    enumeration = _flop_enumeration(hero, villain, tuple(sorted(board[:3])))
+    return enumeration.equity(board[3:], breakdown)
+
+
+def street_outs(hero_strs, villain_strs, board_strs):
+    """
+    Lists the turn or river cards that flip who is ahead, and Hero's equity after each
+    possible next card, from the same flop enumeration street_equity uses.
+
+    :param hero_strs: Hero's two cards, as strings like ['AC', '7C'] or card integers.
+    :param villain_strs: Villain's two cards, as strings like ['KC', '10H'] or card integers.
+    :param board_strs: The flop, or the flop and turn, in the order they were dealt.
+    :return: Dict with 'leader', 'outs' and 'cards', see FlopEnumeration.next_card_breakdown.
+    """
+    if len(board_strs) not in (3, 4):
+        raise ValueError("Outs need a flop or turn board.")
+
+    hero = tuple(sorted(card_to_int(s) for s in hero_strs))
+    villain = tuple(sorted(card_to_int(s) for s in villain_strs))
+    board = [card_to_int(s) for s in board_strs]
+
+    enumeration = _flop_enumeration(hero, villain, tuple(sorted(board[:3])))
+    return enumeration.next_card_breakdown(board[3:])
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    hero, villain, board = ["AC", "7C"], ["KC", "10H"], ["QC", "5H", "2C", "9D", "3S"]
+    for street in range(3, 6):
+        start = time.perf_counter()
+        result = street_equity(hero, villain, board[:street])
+        print(f"{street} cards: {result} in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    for street in (3, 4):
+        breakdown = street_outs(hero, villain, board[:street])
+        print(f"{street} cards: leader {breakdown['leader']}, outs {[CARD_STRS[c] for c in breakdown['outs']]}")